@@ -0,0 +1,305 @@
+"""
+Load test that replays realistic typing sessions against autocomplete views.
+
+Starts a threaded Django development server on a temporary SQLite database,
+then simulates concurrent typists filling in forms the way autocomplete.js
+drives the server: keystrokes with jittered timing, occasional typos fixed
+with backspace, a request only after the debounce delay passes without a
+keystroke, and several autocomplete fields per form. A field is done once the
+wanted entry shows up in the results of the latest request.
+
+    python benchmarks/typing_load.py --typists 20 --forms 5 --debounce-ms 300
+
+Reports requests per completed selection, request latency percentiles and
+database queries per second, for sizing workers and comparing changes to
+debounce, caching or search backends.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import django
+from django.conf import settings
+
+
+class Stats:
+    """Thread-safe counters shared by the server and the typists."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.queries = 0
+        self.selections = 0
+        self.abandoned = 0
+
+    def add_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def add(self, name, amount=1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+
+STATS = Stats()
+
+
+class QueryCountMiddleware:
+    """Counts the database queries run by every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from django.db import connection
+
+        def count(execute, sql, params, many, context):
+            STATS.add('queries')
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            return self.get_response(request)
+
+
+def configure(database_path, args):
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='load-test',
+        ALLOWED_HOSTS=['*'],
+        INSTALLED_APPS=[
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'suitable_django_autocomplete',
+        ],
+        DATABASES={'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': database_path,
+            'OPTIONS': {'timeout': 30},
+        }},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        MIDDLEWARE=['benchmarks_typing_load.QueryCountMiddleware'],
+        ROOT_URLCONF='benchmarks_typing_load',
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def build_urlconf(args, words):
+    from django.contrib.auth.models import User
+    from django.urls import path
+
+    from suitable_django_autocomplete.views import ModelAutocompleteView, SimpleAutocompleteView
+
+    class UserView(ModelAutocompleteView):
+        model = User
+        search_fields = ['username', 'first_name', 'last_name']
+        cache_timeout = args.cache_timeout
+        coalesce = args.coalesce
+
+    class WordView(SimpleAutocompleteView):
+        choices = words
+        cache_timeout = args.cache_timeout
+        coalesce = args.coalesce
+
+    return [
+        path('users/', UserView.as_view()),
+        path('words/', WordView.as_view()),
+    ]
+
+
+def populate(rows, words):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    rng = random.Random(1)
+    User.objects.bulk_create(
+        [
+            User(
+                username=f'{rng.choice(words)}{i}',
+                first_name=rng.choice(words).title(),
+                last_name=rng.choice(words).title(),
+            )
+            for i in range(rows)
+        ],
+        batch_size=1000,
+    )
+    return list(User.objects.values_list('username', 'first_name', 'last_name'))
+
+
+def start_server():
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=True)
+    server.set_app(WSGIHandler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def fetch(url, query):
+    start = time.perf_counter()
+    try:
+        with urlopen(f'{url}?{urlencode({"q": query})}', timeout=30) as response:
+            data = json.load(response)
+    except Exception:
+        STATS.add('errors')
+        return []
+    STATS.add_latency(time.perf_counter() - start)
+    return data.get('results', [])
+
+
+def label_of(result):
+    return result if isinstance(result, str) else result.get('label', '')
+
+
+class Typist:
+    """Types into one field after another, like a user filling in a form."""
+
+    def __init__(self, args, base_url, fields, executor, seed):
+        self.args = args
+        self.base_url = base_url
+        self.fields = fields
+        self.executor = executor
+        self.rng = random.Random(seed)
+
+    def keystroke_delay(self):
+        return max(0.02, self.rng.gauss(self.args.keystroke_ms, self.args.keystroke_ms / 3)) / 1000
+
+    def keystrokes(self, target):
+        """Text after each keystroke, including typos fixed with backspace."""
+        text = ''
+        for char in target:
+            if self.rng.random() < self.args.typo_rate:
+                yield text + self.rng.choice(string.ascii_lowercase)
+                yield text  # backspace
+            text += char
+            yield text
+
+    def fill_field(self, endpoint, target):
+        """Returns True once target appears in the results of the latest request."""
+        url = self.base_url + endpoint
+        wanted = target.lower()
+        debounce = self.args.debounce_ms / 1000
+        latest = None
+        sent = None
+
+        def found(future):
+            return any(wanted == label_of(result).lower() for result in future.result())
+
+        for text in self.keystrokes(wanted):
+            # The user picks the entry as soon as the latest results show it
+            if latest is not None and latest.done() and found(latest):
+                return True
+            delay = self.keystroke_delay()
+            if len(text) >= self.args.min_length and delay >= debounce:
+                # Paused long enough for the debounced request to fire
+                time.sleep(debounce)
+                latest, sent = self.executor.submit(fetch, url, text), text
+                time.sleep(delay - debounce)
+            else:
+                time.sleep(delay)
+
+        # Done typing: the request for the full text fires after the debounce
+        if sent != wanted and len(wanted) >= self.args.min_length:
+            time.sleep(debounce)
+            latest = self.executor.submit(fetch, url, wanted)
+        return latest is not None and found(latest)
+
+    def run(self):
+        for _ in range(self.args.forms):
+            for endpoint, targets in self.fields:
+                if self.fill_field(endpoint, self.rng.choice(targets)):
+                    STATS.add('selections')
+                else:
+                    STATS.add('abandoned')
+                time.sleep(self.args.field_pause_ms / 1000)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--typists', type=int, default=10, help='concurrent users (default: 10)')
+    parser.add_argument('--forms', type=int, default=3, help='forms each typist fills in (default: 3)')
+    parser.add_argument('--fields', type=int, default=2, help='autocomplete fields per form (default: 2)')
+    parser.add_argument('--keystroke-ms', type=float, default=180, help='mean time between keystrokes (default: 180)')
+    parser.add_argument('--debounce-ms', type=float, default=300, help='client debounce delay (default: 300)')
+    parser.add_argument('--min-length', type=int, default=2, help='client min_length (default: 2)')
+    parser.add_argument('--typo-rate', type=float, default=0.05, help='chance of a typo per keystroke (default: 0.05)')
+    parser.add_argument('--field-pause-ms', type=float, default=500, help='pause between fields (default: 500)')
+    parser.add_argument('--rows', type=int, default=20000, help='users in the database (default: 20000)')
+    parser.add_argument('--cache-timeout', type=int, default=None, help='result cache timeout of the views')
+    parser.add_argument('--coalesce', action='store_true', help='share identical concurrent queries')
+    args = parser.parse_args()
+
+    sys.modules['benchmarks_typing_load'] = sys.modules[__name__]
+    rng = random.Random(0)
+    words = sorted({''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(5000)})
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(os.path.join(directory, 'load.sqlite3'), args)
+        global urlpatterns
+        urlpatterns = build_urlconf(args, words)
+        users = populate(args.rows, words)
+        server, base_url = start_server()
+
+        user_targets = [username for username, _, _ in users]
+        fields = [('/users/', user_targets), ('/words/', words)] * args.fields
+        fields = fields[:args.fields]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.typists * 2) as executor:
+            typists = [Typist(args, base_url, fields, executor, seed) for seed in range(args.typists)]
+            threads = [threading.Thread(target=typist.run) for typist in typists]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+
+    latencies = sorted(STATS.latencies)
+    requests = len(latencies) + STATS.errors
+    completed = STATS.selections
+    print(f"Typists:                 {args.typists} x {args.forms} forms x {args.fields} fields")
+    print(f"Duration:                {elapsed:.1f}s")
+    print(f"Selections:              {completed} completed, {STATS.abandoned} not found")
+    print(f"Requests:                {requests} ({STATS.errors} errors, {requests / elapsed:.1f}/s)")
+    print(f"Requests per selection:  {requests / completed if completed else float('nan'):.2f}")
+    print(f"Latency p50/p95/p99:     "
+          f"{percentile(latencies, 0.50) * 1000:.1f} / "
+          f"{percentile(latencies, 0.95) * 1000:.1f} / "
+          f"{percentile(latencies, 0.99) * 1000:.1f} ms"
+          + (f" (mean {statistics.mean(latencies) * 1000:.1f} ms)" if latencies else ""))
+    print(f"DB queries:              {STATS.queries} ({STATS.queries / elapsed:.1f}/s)")
+
+
+urlpatterns = []
+
+if __name__ == '__main__':
+    main()
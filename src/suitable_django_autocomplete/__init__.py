@@ -2,14 +2,16 @@
 
 __version__ = "0.6.1"
 
-from .widgets import AutocompleteWidget
-from .fields import AutocompleteField, ModelAutocompleteField
+from .widgets import AutocompleteWidget, MultipleAutocompleteWidget
+from .fields import AutocompleteField, ModelAutocompleteField, ModelMultipleAutocompleteField
 from .views import AutocompleteView, ModelAutocompleteView, SimpleAutocompleteView
 
 __all__ = [
     "AutocompleteWidget",
+    "MultipleAutocompleteWidget",
     "AutocompleteField", 
     "ModelAutocompleteField",
+    "ModelMultipleAutocompleteField",
     "AutocompleteView",
     "ModelAutocompleteView",
     "SimpleAutocompleteView",
@@ -0,0 +1,198 @@
+"""
+Memory-mapped choice index for SimpleAutocompleteView.
+
+The index is a single file holding the choices sorted by their normalized
+search key. Every worker process maps the same file read-only, so its pages
+live once in the OS page cache however many workers there are, and opening
+it costs nothing but the mmap call.
+
+File layout (native byte order, uint32 throughout):
+
+    header          magic, byte order mark, count, keys size, payloads size
+    key offsets     count + 1 offsets into the keys blob
+    payload offsets count + 1 offsets into the payloads blob
+    keys blob       normalized search keys, each followed by a newline
+    payloads blob   JSON encoded choices, in key order
+
+Prefix queries binary search the sorted keys. Substring queries scan the keys
+blob with mmap.find(), which runs in C without copying, and map each hit back
+to its entry by bisecting the key offsets.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .fuzzy import normalize
+
+MAGIC = b'SDACIX01'
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct('=8sIIII')
+MAX_OFFSET = 0xFFFFFFFF
+
+_open_indexes: Dict[str, 'ChoiceIndex'] = {}
+_open_lock = threading.Lock()
+
+
+def search_key(choice: Any) -> str:
+    """Normalized text a choice is matched on."""
+    return normalize(str(choice)).replace('\n', ' ')
+
+
+def build_choice_index(path: str, choices: Iterable[Any],
+                       keys: Optional[Iterable[str]] = None) -> int:
+    """
+    Write an index of choices to path, atomically replacing any existing
+    file so workers never map a half written index. `keys` are the
+    normalized texts to match the choices on, defaulting to search_key().
+    Returns the entry count.
+    """
+    choices = list(choices)
+    if keys is None:
+        keys = (search_key(choice) for choice in choices)
+    entries = sorted(
+        ((key.encode(), json.dumps(choice).encode()) for key, choice in zip(keys, choices)),
+        key=lambda entry: entry[0],
+    )
+
+    # Check the sizes before packing: array('I') raises OverflowError instead
+    key_sizes = list(accumulate((len(key) + 1 for key, _ in entries), initial=0))
+    payload_sizes = list(accumulate((len(payload) for _, payload in entries), initial=0))
+    if max(key_sizes[-1], payload_sizes[-1]) > MAX_OFFSET:
+        raise ValueError("Choice index too large")
+    key_offsets = array('I', key_sizes)
+    payload_offsets = array('I', payload_sizes)
+    if key_offsets.itemsize != 4:
+        raise ValueError("Choice index needs 32 bit unsigned ints")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.choice-index-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, len(entries),
+                                     key_offsets[-1], payload_offsets[-1]))
+            key_offsets.tofile(handle)
+            payload_offsets.tofile(handle)
+            for key, _ in entries:
+                handle.write(key + b'\n')
+            for _, payload in entries:
+                handle.write(payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(entries)
+
+
+class ChoiceIndex:
+    """A read-only, memory-mapped choice index. Use open_choice_index() to share instances."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, mark, count, keys_size, payloads_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or mark != BYTE_ORDER_MARK:
+            raise ValueError(f"{path} is not a choice index for this platform")
+
+        self._view = view = memoryview(self._mmap)
+        start = HEADER.size
+        self._key_offsets = view[start:start + 4 * (count + 1)].cast('I')
+        start += 4 * (count + 1)
+        self._payload_offsets = view[start:start + 4 * (count + 1)].cast('I')
+        start += 4 * (count + 1)
+        self._keys_start = start
+        self._keys_end = start + keys_size
+        self._payloads_start = self._keys_end
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key(self, position: int) -> bytes:
+        start = self._keys_start + self._key_offsets[position]
+        end = self._keys_start + self._key_offsets[position + 1] - 1
+        return self._mmap[start:end]
+
+    def choice(self, position: int) -> Any:
+        start = self._payloads_start + self._payload_offsets[position]
+        end = self._payloads_start + self._payload_offsets[position + 1]
+        return json.loads(self._mmap[start:end])
+
+    def _first_at_or_after(self, key: bytes) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _prefix_matches(self, needle: bytes, limit: int) -> List[int]:
+        position = self._first_at_or_after(needle)
+        matches = []
+        while position < self.count and len(matches) < limit and self._key(position).startswith(needle):
+            matches.append(position)
+            position += 1
+        return matches
+
+    def _substring_matches(self, needle: bytes, limit: int, exclude: Set[int]) -> List[int]:
+        matches = []
+        offset = self._keys_start
+        while len(matches) < limit:
+            found = self._mmap.find(needle, offset, self._keys_end)
+            if found == -1:
+                break
+            position = bisect_right(self._key_offsets, found - self._keys_start) - 1
+            if position not in exclude:
+                matches.append(position)
+                exclude.add(position)
+            # Continue after this entry; one hit per entry is enough
+            offset = self._keys_start + self._key_offsets[position + 1]
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[Any]:
+        """
+        Choices whose key contains the query: prefix matches first (in key
+        order), then matches at the start of a later word, then the rest.
+        """
+        needle = normalize(query).replace('\n', ' ').encode()
+        if not needle:
+            return []
+        positions = self._prefix_matches(needle, limit)
+        seen = set(positions)
+        if len(positions) < limit:
+            positions += self._substring_matches(b' ' + needle, limit - len(positions), seen)
+        if len(positions) < limit:
+            positions += self._substring_matches(needle, limit - len(positions), seen)
+        return [self.choice(position) for position in positions]
+
+    def close(self) -> None:
+        self._key_offsets.release()
+        self._payload_offsets.release()
+        self._view.release()
+        self._mmap.close()
+
+
+def open_choice_index(path: str) -> ChoiceIndex:
+    """
+    Return the process-wide ChoiceIndex for path. Raises FileNotFoundError if
+    the index hasn't been built. A rebuilt file is picked up by processes
+    started after the rebuild; running ones keep their mapping of the old one.
+    """
+    index = _open_indexes.get(path)
+    if index is None:
+        with _open_lock:
+            index = _open_indexes.get(path)
+            if index is None:
+                index = _open_indexes[path] = ChoiceIndex(path)
+    return index
@@ -0,0 +1,109 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+
+When many users type the same query at the same moment, only the first
+request computes the results; the others wait for it and share its answer.
+SingleFlight does this between the threads of a process. The cache lock
+helpers extend it across processes through a Django cache, see
+AutocompleteView.coalesce_lock_timeout.
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time. Callers arriving while
+    one is in flight get its result (or exception) instead of starting their
+    own. Nothing is kept once the computation finishes; that is what the
+    result cache is for.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Return fn(), sharing the call with other threads asking for key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+flights = SingleFlight()
+
+
+def acquire_cache_lock(cache: Any, key: str, timeout: float) -> Optional[str]:
+    """
+    Try to take the lock at key, returning a token for release_cache_lock(),
+    or None if another process holds it. The lock expires after timeout
+    seconds so a crashed holder can't keep it.
+    """
+    token = uuid.uuid4().hex
+    if cache.add(key, token, timeout):
+        return token
+    return None
+
+
+def release_cache_lock(cache: Any, key: str, token: str) -> None:
+    # Not atomic, but at worst an expired lock that another process has
+    # since taken is released early and one extra computation runs
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+def wait_for_cache(cache: Any, lock_key: str, fetch: Callable[[], Optional[T]],
+                   timeout: float, interval: float = 0.05) -> Optional[T]:
+    """
+    Poll fetch() while another process holds lock_key, for at most timeout
+    seconds. Returns the first value that isn't None, or None if the lock
+    was released or the wait timed out without one.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        value = fetch()
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            # The holder stores its results before releasing the lock
+            return fetch()
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(interval)
@@ -0,0 +1,90 @@
+"""
+Columnar storage for structured (dict) choices.
+
+ChoiceColumns turns a list of dicts into one pre-normalized string per search
+key, with the rows separated by newlines, plus an array of row offsets. A
+query is located with str.find() over each column, which runs in C, and only
+the rows it hits are scored. The response rows are built once up front, so a
+request neither walks the dicts nor lowercases anything but the query.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .fuzzy import normalize
+from .ranking import EXACT, PREFIX, SUBSTRING, WORD_PREFIX
+
+
+def _clean(value: Any) -> str:
+    return normalize('' if value is None else str(value)).replace('\n', ' ')
+
+
+class ChoiceColumns:
+    """Pre-normalized search columns and prebuilt response rows for dict choices."""
+
+    __slots__ = ('search_keys', 'rows', 'columns', 'offsets', 'size')
+
+    def __init__(self, choices: Sequence[Dict[str, Any]], search_keys: Sequence[str],
+                 value_key: Optional[str] = None, label_key: Optional[str] = None) -> None:
+        self.search_keys = tuple(search_keys)
+        self.size = len(choices)
+
+        # Rows are served as {'value', 'label'} pairs when the keys are
+        # declared, and as the original dicts otherwise
+        if value_key and label_key:
+            self.rows = tuple(
+                {'value': choice.get(value_key), 'label': choice.get(label_key)}
+                for choice in choices
+            )
+        else:
+            self.rows = tuple(choices)
+
+        self.columns: List[str] = []
+        self.offsets: List[array] = []
+        for key in self.search_keys:
+            values = [_clean(choice.get(key)) for choice in choices]
+            offsets = array('I', [0])
+            for value in values:
+                offsets.append(offsets[-1] + len(value) + 1)
+            self.columns.append('\n'.join(values) + '\n')
+            self.offsets.append(offsets)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def texts(self) -> Iterator[str]:
+        """Combined search text per row, e.g. for building a FuzzyIndex."""
+        for row in range(self.size):
+            yield ' '.join(
+                column[offsets[row]:offsets[row + 1] - 1]
+                for column, offsets in zip(self.columns, self.offsets)
+            )
+
+    def scores(self, query: str) -> Dict[int, int]:
+        """Best match tier per matching row across all search columns."""
+        needle = _clean(query)
+        best: Dict[int, int] = {}
+        if not needle:
+            return best
+        for column, offsets in zip(self.columns, self.offsets):
+            found = column.find(needle)
+            while found != -1:
+                row = bisect_right(offsets, found) - 1
+                start, end = offsets[row], offsets[row + 1] - 1
+                if found == start:
+                    score = EXACT if found + len(needle) == end else PREFIX
+                elif column[found - 1] == ' ':
+                    score = WORD_PREFIX
+                else:
+                    score = SUBSTRING
+                if score > best.get(row, 0):
+                    best[row] = score
+                found = column.find(needle, found + 1)
+        return best
+
+    def search(self, query: str, limit: int = 20) -> List[Any]:
+        """The `limit` best matching rows, best first, ties in choice order."""
+        ranked = heapq.nsmallest(limit, ((-score, row) for row, score in self.scores(query).items()))
+        return [self.rows[row] for _, row in ranked]
@@ -0,0 +1,90 @@
+"""
+Database-enforced time budgets for autocomplete queries.
+
+query_deadline() makes the database abort queries that run past a budget:
+PostgreSQL through statement_timeout and SQLite through a progress handler.
+On other backends queries are not interrupted, but an error raised after the
+deadline is still reported as QueryDeadlineExceeded.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+# SQLite virtual machine instructions between deadline checks
+SQLITE_PROGRESS_STEPS = 1000
+
+
+class QueryDeadlineExceeded(Exception):
+    """Raised when a query is aborted for running past its time budget."""
+
+
+@contextmanager
+def _postgresql_timeout(connection, seconds: float) -> Iterator[None]:
+    timeout = f'{max(1, int(seconds * 1000))}ms'
+    if not connection.in_atomic_block:
+        # SET LOCAL lasts until the end of the transaction opened for it, so
+        # there is nothing to restore: one statement besides BEGIN/COMMIT
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [timeout])
+            yield
+        return
+
+    # Inside the caller's transaction the setting outlives our savepoint,
+    # so restore the previous value on success
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('statement_timeout')")
+            previous = cursor.fetchone()[0]
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [timeout])
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+
+
+@contextmanager
+def _sqlite_timeout(connection, deadline: float) -> Iterator[None]:
+    connection.ensure_connection()
+    raw = connection.connection
+    # Returning a true value makes SQLite abort with "interrupted"
+    raw.set_progress_handler(lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS)
+    try:
+        yield
+    finally:
+        raw.set_progress_handler(None, SQLITE_PROGRESS_STEPS)
+
+
+@contextmanager
+def query_deadline(seconds: Optional[float],
+                   using: Optional[str] = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """
+    Abort database queries on `using` that run longer than `seconds` in
+    total, raising QueryDeadlineExceeded. A budget of None disables it, and
+    so does using=None, for code that queries no database.
+    """
+    if seconds is None or using is None:
+        yield
+        return
+
+    connection = connections[using]
+    deadline = time.monotonic() + seconds
+    if connection.vendor == 'postgresql':
+        enforce = _postgresql_timeout(connection, seconds)
+    elif connection.vendor == 'sqlite':
+        enforce = _sqlite_timeout(connection, deadline)
+    else:
+        enforce = None
+
+    try:
+        if enforce is None:
+            yield
+        else:
+            with enforce:
+                yield
+    except DatabaseError as error:
+        if time.monotonic() >= deadline:
+            raise QueryDeadlineExceeded(f"Query exceeded its {seconds}s budget") from error
+        raise
@@ -6,7 +6,7 @@ These can be used as references or directly in your project.
 from django import forms
 from django.contrib.auth.models import User
 from .views import ModelAutocompleteView, SimpleAutocompleteView
-from .fields import AutocompleteField, ModelAutocompleteField
+from .fields import AutocompleteField, ModelAutocompleteField, ModelMultipleAutocompleteField
 from .widgets import AutocompleteWidget
 
 
@@ -38,36 +38,27 @@ class FruitAutocompleteView(SimpleAutocompleteView):
 class CountryAutocompleteView(SimpleAutocompleteView):
     """Example autocomplete with more complex data."""
     
-    def get_choices(self):
-        # In a real app, this might come from a database or API
-        return [
-            {'code': 'US', 'name': 'United States'},
-            {'code': 'CA', 'name': 'Canada'},
-            {'code': 'MX', 'name': 'Mexico'},
-            {'code': 'GB', 'name': 'United Kingdom'},
-            {'code': 'FR', 'name': 'France'},
-            {'code': 'DE', 'name': 'Germany'},
-            {'code': 'IT', 'name': 'Italy'},
-            {'code': 'ES', 'name': 'Spain'},
-            {'code': 'JP', 'name': 'Japan'},
-            {'code': 'CN', 'name': 'China'},
-            {'code': 'IN', 'name': 'India'},
-            {'code': 'BR', 'name': 'Brazil'},
-            {'code': 'AU', 'name': 'Australia'},
-        ]
-    
-    def get_results(self, query):
-        """Search in both code and name."""
-        choices = self.get_choices()
-        query_lower = query.lower()
-        
-        results = []
-        for country in choices:
-            if (query_lower in country['code'].lower() or 
-                query_lower in country['name'].lower()):
-                results.append(country)
-        
-        return results[:10]
+    # In a real app, this might come from a database or API
+    choices = [
+        {'code': 'US', 'name': 'United States'},
+        {'code': 'CA', 'name': 'Canada'},
+        {'code': 'MX', 'name': 'Mexico'},
+        {'code': 'GB', 'name': 'United Kingdom'},
+        {'code': 'FR', 'name': 'France'},
+        {'code': 'DE', 'name': 'Germany'},
+        {'code': 'IT', 'name': 'Italy'},
+        {'code': 'ES', 'name': 'Spain'},
+        {'code': 'JP', 'name': 'Japan'},
+        {'code': 'CN', 'name': 'China'},
+        {'code': 'IN', 'name': 'India'},
+        {'code': 'BR', 'name': 'Brazil'},
+        {'code': 'AU', 'name': 'Australia'},
+    ]
+    # Search in both code and name, answer with code/name as value/label
+    search_keys = ['code', 'name']
+    value_key = 'code'
+    label_key = 'name'
+    limit = 10
 
 
 # Example Forms
@@ -106,9 +97,11 @@ class UserSelectionForm(forms.Form):
         help_text='Search by username, email, or name'
     )
     
-    reviewers = forms.CharField(
-        widget=AutocompleteWidget(url='/autocomplete/users/'),
-        help_text='Enter multiple reviewers separated by commas',
+    reviewers = ModelMultipleAutocompleteField(
+        queryset=User.objects.filter(is_active=True),
+        url='/autocomplete/users/',
+        search_fields=['username'],
+        help_text='Search for one or more reviewers',
         required=False
     )
 
@@ -1,16 +1,22 @@
 from django import forms
-from .widgets import AutocompleteWidget
+from django.core.exceptions import ValidationError
+from django.core.validators import ProhibitNullCharactersValidator
+from .routing import run_read
+from .widgets import AutocompleteWidget, MultipleAutocompleteWidget
 
 
 class AutocompleteField(forms.CharField):
     """Form field that uses the AutocompleteWidget by default."""
     
     def __init__(self, *args, url=None, min_length=2, debounce_delay=300, attrs=None, 
-                 host_attrs=None, **kwargs):
+                 host_attrs=None, source=None, lazy=None, limit=20, **kwargs):
         self.url = url
         self.min_length = min_length
         self.debounce_delay = debounce_delay
         self.host_attrs = host_attrs
+        self.source = source
+        self.lazy = lazy
+        self.limit = limit
         
         # Set the widget if not already specified
         if 'widget' not in kwargs:
@@ -19,22 +25,31 @@ class AutocompleteField(forms.CharField):
                 min_length=min_length,
                 debounce_delay=debounce_delay,
                 attrs=attrs,
-                host_attrs=host_attrs
+                host_attrs=host_attrs,
+                source=source,
+                lazy=lazy,
+                limit=limit
             )
         
         super().__init__(*args, **kwargs)
 
 
 class ModelAutocompleteField(forms.ModelChoiceField):
-    """Model choice field that uses the AutocompleteWidget."""
+    """
+    Model choice field that uses the AutocompleteWidget.
+    Set using to read from a database alias or a list of read replicas (see
+    routing.py); keys missing on a replica are looked up on the primary.
+    """
     
     def __init__(self, queryset, *args, url=None, min_length=2, debounce_delay=300, attrs=None, 
-                 host_attrs=None, search_fields=None, **kwargs):
+                 host_attrs=None, search_fields=None, lazy=None, using=None, **kwargs):
         self.url = url
         self.min_length = min_length
         self.debounce_delay = debounce_delay
         self.host_attrs = host_attrs
         self.search_fields = search_fields or []
+        self.lazy = lazy
+        self.using = using
         
         # Set the widget if not already specified
         if 'widget' not in kwargs:
@@ -43,20 +58,38 @@ class ModelAutocompleteField(forms.ModelChoiceField):
                 min_length=min_length,
                 debounce_delay=debounce_delay,
                 attrs=attrs,
-                host_attrs=host_attrs
+                host_attrs=host_attrs,
+                lazy=lazy
             )
         
         super().__init__(queryset, *args, **kwargs)
+        self._prefetched = None
     
+    def prefetch(self, instances):
+        """
+        Provide already fetched instances, keyed by the string form of their
+        key, so to_python() doesn't query for them. Used by the formset mixin
+        in formsets.py to validate many forms with one query.
+        """
+        self._prefetched = instances
+    
+    def read(self, fn, retry_on_primary=()):
+        """Return fn(queryset) with the queryset on the database `using` selects."""
+        return run_read(self.using, self.queryset, fn, retry_on_primary)
     
     def to_python(self, value):
         """Convert the autocomplete value to a model instance."""
         if value in self.empty_values:
             return None
+        if self._prefetched is not None and str(value) in self._prefetched:
+            return self._prefetched[str(value)]
         try:
             # Try to get by primary key first
             key = self.to_field_name or 'pk'
-            value = self.queryset.get(**{key: value})
+            value = self.read(
+                lambda queryset: queryset.get(**{key: value}),
+                retry_on_primary=(self.queryset.model.DoesNotExist,),
+            )
         except (ValueError, TypeError, self.queryset.model.DoesNotExist):
             # If that fails, try to get by string representation
             # This allows for more flexible autocomplete implementations
@@ -115,7 +148,7 @@ class ModelAutocompleteField(forms.ModelChoiceField):
                     obj = value
                 elif prepared_value:
                     # It's an ID, try to fetch the instance
-                    obj = self.queryset.get(pk=prepared_value)
+                    obj = self.read(lambda queryset: queryset.get(pk=prepared_value))
                 else:
                     obj = None
                 
@@ -126,4 +159,129 @@ class ModelAutocompleteField(forms.ModelChoiceField):
                 pass
         
         # Ensure we return a string
-        return str(prepared_value) if prepared_value is not None else ''
\ No newline at end of file
+        return str(prepared_value) if prepared_value is not None else ''
+
+
+class ModelMultipleAutocompleteField(forms.ModelMultipleChoiceField):
+    """
+    Model multiple choice field that uses the MultipleAutocompleteWidget.
+    Submitted keys are validated with a single query, and initial labels are
+    looked up with a single query, however many values are selected.
+    Takes the same using option as ModelAutocompleteField.
+    """
+    widget = MultipleAutocompleteWidget
+    
+    def __init__(self, queryset, *args, url=None, min_length=2, debounce_delay=300, attrs=None, 
+                 host_attrs=None, search_fields=None, lazy=None, using=None, **kwargs):
+        self.url = url
+        self.min_length = min_length
+        self.debounce_delay = debounce_delay
+        self.host_attrs = host_attrs
+        self.search_fields = search_fields or []
+        self.lazy = lazy
+        self.using = using
+        
+        # Set the widget if not already specified
+        if 'widget' not in kwargs:
+            kwargs['widget'] = MultipleAutocompleteWidget(
+                url=url,
+                min_length=min_length,
+                debounce_delay=debounce_delay,
+                attrs=attrs,
+                host_attrs=host_attrs,
+                lazy=lazy
+            )
+        
+        super().__init__(queryset, *args, **kwargs)
+        self._cleaning = False
+    
+    def clean(self, value):
+        # ModelMultipleChoiceField.clean() calls prepare_value(); labels are
+        # only needed for rendering, so don't look them up while cleaning
+        self._cleaning = True
+        try:
+            return super().clean(value)
+        finally:
+            self._cleaning = False
+    
+    def read(self, fn, retry_on_primary=()):
+        """Return fn(queryset) with the queryset on the database `using` selects."""
+        return run_read(self.using, self.queryset, fn, retry_on_primary)
+    
+    def _check_values(self, value):
+        """
+        Return the objects for a list of keys, read from the database `using`
+        selects, and retry on the primary when a key is missing there in case
+        it was created a moment ago. Mirrors Django's own _check_values()
+        against the read queryset, as assigning self.queryset would reset the
+        widget's choices.
+        """
+        key = self.to_field_name or 'pk'
+        try:
+            value = frozenset(value)
+        except TypeError:
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        for pk in value:
+            ProhibitNullCharactersValidator()(pk)
+            try:
+                self.queryset.filter(**{key: pk})
+            except (ValueError, TypeError, ValidationError):
+                raise ValidationError(
+                    self.error_messages['invalid_pk_value'], code='invalid_pk_value', params={'pk': pk},
+                )
+        
+        def check(queryset):
+            queryset = queryset.filter(**{f'{key}__in': value})
+            keys = {str(getattr(obj, key)) for obj in queryset}
+            for val in value:
+                if str(val) not in keys:
+                    raise ValidationError(
+                        self.error_messages['invalid_choice'], code='invalid_choice', params={'value': val},
+                    )
+            return queryset
+        
+        return self.read(check, retry_on_primary=(ValidationError,))
+    
+    def prepare_value(self, value):
+        """
+        Prepare the values for display in the widget.
+        Also adds the value/label pairs for the chips to the widget's
+        initial_items, looking up labels only for values it has none for:
+        has_changed() prepares the initial values, so a later call for the
+        values being rendered may bring new ones.
+        """
+        prepared_values = super().prepare_value(value)
+        
+        if self._cleaning or not value or isinstance(value, str) or not hasattr(value, '__iter__'):
+            return prepared_values
+        
+        labelled = {item['value'] for item in self.widget.initial_items}
+        new_values = [prepared for prepared in prepared_values if str(prepared) not in labelled]
+        if not new_values:
+            return prepared_values
+        
+        # Instances are used as they are; bare keys are fetched in one query
+        instances = {
+            str(prepared): original
+            for original, prepared in zip(value, prepared_values)
+            if hasattr(original, 'pk')
+        }
+        missing = [prepared for prepared in new_values if str(prepared) not in instances]
+        if missing:
+            try:
+                found = self.read(
+                    lambda queryset: queryset.in_bulk(missing, field_name=self.to_field_name or 'pk')
+                )
+                instances.update({str(key): obj for key, obj in found.items()})
+            except (ValueError, TypeError, ValidationError):
+                pass
+        
+        new_items = {
+            str(prepared): {
+                'value': str(prepared),
+                'label': self.widget.get_display_value_for_instance(instances[str(prepared)], self.search_fields),
+            }
+            for prepared in new_values if str(prepared) in instances
+        }
+        self.widget.initial_items = self.widget.initial_items + list(new_items.values())
+        return prepared_values
@@ -0,0 +1,167 @@
+"""
+Typo-tolerant matching for static choices.
+
+``FuzzyIndex`` is a SymSpell-style deletion dictionary built once over the
+words of every choice. Looking up a query word only generates the deletions
+of that word and verifies the handful of indexed prefixes that share one, so
+the cost per query does not grow with the number of choices.
+"""
+
+import heapq
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize(text: str) -> str:
+    """Case-fold and strip accents so 'Crème' and 'creme' compare equal."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between a and b (insertions, deletions,
+    substitutions and adjacent transpositions). Returns max_distance + 1 as
+    soon as the distance is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """All strings obtained by deleting up to `distance` characters from word."""
+    results = {word}
+    frontier = {word}
+    for _ in range(min(distance, len(word))):
+        frontier = {text[:i] + text[i + 1:] for text in frontier for i in range(len(text))}
+        results |= frontier
+    return results
+
+
+class FuzzyIndex:
+    """
+    Deletion dictionary over the word prefixes of a list of labels.
+
+    Every word is indexed by its prefixes of min_length..prefix_length
+    characters, so a partially typed word ("recie") matches "receive" the same
+    way a complete one does. Words of fewer than `long_word` characters
+    tolerate a single edit; longer words tolerate up to `max_distance`. Only
+    the longest prefix of a word then gets the much larger set of
+    two-character deletions, which keeps the index to a few dozen entries
+    per word.
+    """
+
+    def __init__(self, labels: Iterable[str], max_distance: int = 2, prefix_length: int = 7,
+                 min_length: int = 3, long_word: int = 7) -> None:
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.long_word = long_word
+
+        # prefix -> ids of the labels containing a word with that prefix
+        self._postings: Dict[str, List[int]] = {}
+        # deletion -> newline separated prefixes it was generated from; one
+        # string per key takes far less memory than a list of strings
+        self._deletes: Dict[str, str] = {}
+
+        size = 0
+        for label_id, label in enumerate(labels):
+            size += 1
+            for word in normalize(label).split():
+                for prefix in self._prefixes(word):
+                    posting = self._postings.get(prefix)
+                    if posting is None:
+                        self._postings[prefix] = [label_id]
+                        self._add_deletes(prefix)
+                    elif posting[-1] != label_id:
+                        posting.append(label_id)
+        self.size = size
+
+    def _prefixes(self, word: str) -> List[str]:
+        if len(word) < self.min_length:
+            return []
+        longest = min(len(word), self.prefix_length)
+        return [word[:n] for n in range(self.min_length, longest + 1)]
+
+    def allowed_distance(self, word: str) -> int:
+        """Edits tolerated for a query word of this length."""
+        return min(self.max_distance, 1 if len(word) < self.long_word else self.max_distance)
+
+    def _add_deletes(self, prefix: str) -> None:
+        for deletion in deletes(prefix, self.allowed_distance(prefix)):
+            prefixes = self._deletes.get(deletion)
+            self._deletes[deletion] = prefix if prefixes is None else f'{prefixes}\n{prefix}'
+
+    def entry_count(self) -> int:
+        """Number of (deletion, prefix) pairs stored, a measure of the index's size."""
+        return sum(prefixes.count('\n') + 1 for prefixes in self._deletes.values())
+
+    def _word_matches(self, word: str, deadline: Optional[float]) -> Dict[int, int]:
+        """Best edit distance per label id for one query word."""
+        word = word[:self.prefix_length]
+        distance = self.allowed_distance(word)
+        best: Dict[int, int] = {}
+        seen: Set[str] = set()
+
+        for deletion in deletes(word, distance):
+            prefixes = self._deletes.get(deletion)
+            for prefix in prefixes.split('\n') if prefixes else ():
+                if prefix in seen:
+                    continue
+                seen.add(prefix)
+                found = edit_distance(word, prefix, distance)
+                if found > distance:
+                    continue
+                for label_id in self._postings[prefix]:
+                    if found < best.get(label_id, distance + 1):
+                        best[label_id] = found
+            if deadline is not None and time.monotonic() > deadline:
+                break
+        return best
+
+    def search(self, query: str, limit: int = 20, time_budget: Optional[float] = None) -> List[int]:
+        """
+        Return up to `limit` label ids matching every word of the query,
+        closest first. With a time_budget (in seconds) the lookup stops once
+        the budget is spent and ranks whatever it has found so far.
+        """
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        words = [w for w in normalize(query).split() if len(w) >= self.min_length]
+        if not words:
+            return []
+
+        totals: Optional[Dict[int, int]] = None
+        for word in words:
+            matches = self._word_matches(word, deadline)
+            if totals is None:
+                totals = matches
+            else:
+                totals = {
+                    label_id: total + matches[label_id]
+                    for label_id, total in totals.items() if label_id in matches
+                }
+            if not totals:
+                return []
+
+        ranked: List[Tuple[int, int]] = heapq.nsmallest(
+            limit, ((total, label_id) for label_id, total in totals.items())
+        )
+        return [label_id for _, label_id in ranked]
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = "Build the memory-mapped choice index of SimpleAutocompleteView subclasses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'views', nargs='+',
+            help="Dotted paths of views with a choice_index_path, e.g. myapp.views.CityAutocompleteView.",
+        )
+
+    def handle(self, *args, **options):
+        for path in options['views']:
+            try:
+                view = import_string(path)()
+            except ImportError as error:
+                raise CommandError(str(error))
+            if not getattr(view, 'choice_index_path', None):
+                raise CommandError(f"{path} has no choice_index_path")
+            count = view.rebuild_choice_index()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} choices in {view.choice_index_path}."))
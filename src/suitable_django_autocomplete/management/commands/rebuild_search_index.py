@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from suitable_django_autocomplete.search_index import get_index, registry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized autocomplete search indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'indexes', nargs='*',
+            help="Names of the indexes to rebuild. Defaults to every registered index.",
+        )
+
+    def handle(self, *args, **options):
+        names = options['indexes'] or sorted(registry)
+        if not names:
+            self.stdout.write("No search indexes are registered.")
+            return
+
+        for name in names:
+            try:
+                index = get_index(name)
+            except LookupError as error:
+                raise CommandError(str(error))
+            count = index.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} objects in '{name}'."))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from suitable_django_autocomplete.recording import recorder
+
+
+class RequestNeeded(Exception):
+    pass
+
+
+class NoRequest:
+    """Stands in for view.request: results are warmed outside any request."""
+
+    def __getattr__(self, name):
+        raise RequestNeeded(name)
+
+
+class Command(BaseCommand):
+    help = "Fill the result cache of autocomplete views with their most frequent recorded queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'views', nargs='+',
+            help="Dotted paths of views with a cache_timeout, e.g. myapp.views.UserAutocompleteView.",
+        )
+        parser.add_argument(
+            '--top', type=int, default=100,
+            help="Number of queries to replay per view (default: 100).",
+        )
+
+    def handle(self, *args, **options):
+        for path in options['views']:
+            try:
+                view = import_string(path)()
+            except ImportError as error:
+                raise CommandError(str(error))
+            view.setup(NoRequest())
+            if getattr(view, 'cache_timeout', None) is None:
+                raise CommandError(f"{path} has no cache_timeout, so there is no cache to warm")
+
+            queries = recorder.top_queries(view.get_view_label(), options['top'])
+            # compute_results() applies the time budget and replica failover
+            # and caches only complete results
+            warmed = 0
+            for query in queries:
+                try:
+                    _, partial = view.compute_results(query)
+                except RequestNeeded as error:
+                    raise CommandError(
+                        f"{path} reads self.request.{error}, so its results can't be computed "
+                        f"outside a request"
+                    )
+                warmed += not partial
+            self.stdout.write(self.style.SUCCESS(f"Warmed {warmed} queries for {path}."))
+            if warmed < len(queries):
+                self.stdout.write(self.style.WARNING(
+                    f"Skipped {len(queries) - warmed} queries that ran out of time budget."
+                ))
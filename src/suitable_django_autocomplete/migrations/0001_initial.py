@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('index', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=255)),
+                ('label', models.CharField(max_length=255)),
+                ('search_text', models.CharField(max_length=500)),
+            ],
+            options={
+                'verbose_name_plural': 'search entries',
+                'indexes': [models.Index(fields=['index', 'search_text'], name='sda_searchentry_text')],
+                'constraints': [models.UniqueConstraint(fields=('index', 'object_id'), name='sda_searchentry_unique_object')],
+            },
+        ),
+    ]
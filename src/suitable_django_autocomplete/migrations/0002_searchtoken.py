@@ -0,0 +1,25 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suitable_django_autocomplete', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('index', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=255)),
+                ('token', models.CharField(max_length=100)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['index', 'token'], name='sda_searchtoken_token'), models.Index(fields=['index', 'object_id'], name='sda_searchtoken_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable object in a denormalized search index.
+
+    search_text holds the case-folded, accent-stripped values of every search
+    field, so lookups need no joins. Entries are maintained by
+    suitable_django_autocomplete.search_index.
+    """
+    id = models.BigAutoField(primary_key=True)
+    index = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255)
+    label = models.CharField(max_length=255)
+    search_text = models.CharField(max_length=500)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['index', 'object_id'], name='sda_searchentry_unique_object'),
+        ]
+        indexes = [
+            models.Index(fields=['index', 'search_text'], name='sda_searchentry_text'),
+        ]
+        verbose_name_plural = 'search entries'
+
+    def __str__(self) -> str:
+        return f"{self.index}: {self.label}"
+
+
+class SearchToken(models.Model):
+    """
+    One word of a SearchEntry's search_text. Word prefix queries are range
+    scans of the (index, token) index, which every backend can serve.
+    """
+    id = models.BigAutoField(primary_key=True)
+    index = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255)
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['index', 'token'], name='sda_searchtoken_token'),
+            models.Index(fields=['index', 'object_id'], name='sda_searchtoken_object'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.index}: {self.token}"
@@ -0,0 +1,73 @@
+"""
+Relevance ranking for autocomplete matches.
+
+A match is scored by how it matches the query: an exact match beats a prefix
+match, which beats a match at the start of a later word, which beats a match
+anywhere else. The same tiers are used for in-memory choices (match_score)
+and pushed down to the database for querysets (relevance_expression).
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+EXACT = 4
+PREFIX = 3
+WORD_PREFIX = 2
+SUBSTRING = 1
+NO_MATCH = 0
+
+
+def match_score(text: str, query: str) -> int:
+    """Score an already lowercased text against an already lowercased query."""
+    position = text.find(query)
+    if position == -1:
+        return NO_MATCH
+    if position == 0:
+        return EXACT if len(text) == len(query) else PREFIX
+    if text[position - 1] == ' ' or f' {query}' in text:
+        return WORD_PREFIX
+    return SUBSTRING
+
+
+def top_k(items: Iterable[Any], score: Callable[[Any], int], limit: int) -> List[Any]:
+    """
+    Return the `limit` highest scoring items, best first, without sorting or
+    materialising every match. Ties keep their original order; items scoring
+    NO_MATCH are dropped.
+    """
+    scored = (
+        (-points, position, item)
+        for position, item in enumerate(items)
+        for points in (score(item),)
+        if points > NO_MATCH
+    )
+    return [item for _, _, item in heapq.nsmallest(limit, scored)]
+
+
+def relevance_expression(fields: Sequence[str], query: str, weights: Dict[str, int]) -> Case:
+    """
+    Build a Case expression scoring a row by its best (tier x field weight)
+    match across fields. Whens are ordered best first, so the database stops
+    at the first one that matches.
+    """
+    lookups = (
+        (EXACT, 'iexact', query),
+        (PREFIX, 'istartswith', query),
+        (WORD_PREFIX, 'icontains', f' {query}'),
+        (SUBSTRING, 'icontains', query),
+    )
+    whens = sorted(
+        (
+            (tier * weights.get(field, 1), f'{field}__{lookup}', value)
+            for tier, lookup, value in lookups
+            for field in fields
+        ),
+        key=lambda when: -when[0],
+    )
+    return Case(
+        *(When(Q(**{lookup: value}), then=Value(points)) for points, lookup, value in whens),
+        default=Value(NO_MATCH),
+        output_field=IntegerField(),
+    )
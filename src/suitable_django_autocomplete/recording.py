@@ -0,0 +1,93 @@
+"""
+Sampled recording of autocomplete queries, for warming result caches.
+
+Views with a record_sample_rate pass a sample of their queries to the
+process-wide `recorder`, which counts them in memory and merges the counts
+into the Django cache in batches. The warm_autocomplete_cache management
+command replays the most frequent queries to fill the result cache before
+traffic arrives. Use a cache backend shared by all processes (Redis,
+Memcached, database) so the counts of every worker end up together.
+"""
+
+import atexit
+import threading
+from collections import Counter
+from typing import Dict, List
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+
+class QueryRecorder:
+    """
+    Bounded per-view query counters, flushed to the cache every `flush_every`
+    recorded queries. Each view keeps at most `max_entries` distinct queries;
+    when the limit is hit the least frequent half is dropped.
+    """
+
+    def __init__(self, max_entries: int = 1000, flush_every: int = 100,
+                 cache_alias: str = DEFAULT_CACHE_ALIAS, timeout: int = 7 * 24 * 3600) -> None:
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = {}
+        self._pending = 0
+        self._flush_at_exit = False
+
+    def cache_key(self, view: str) -> str:
+        return f"suitable_django_autocomplete:queries:{view}"
+
+    def _trim(self, counts: Counter) -> Counter:
+        if len(counts) <= self.max_entries:
+            return counts
+        return Counter(dict(counts.most_common(self.max_entries // 2)))
+
+    def record(self, view: str, query: str) -> None:
+        query = normalize_query(query)
+        if not query:
+            return
+        with self._lock:
+            if not self._flush_at_exit:
+                # Only processes that record anything flush at exit
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+            counts = self._counts.setdefault(view, Counter())
+            counts[query] += 1
+            self._counts[view] = self._trim(counts)
+            self._pending += 1
+            if self._pending < self.flush_every:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Merge the local counts into the cache and reset them."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._pending = 0
+        if not counts:
+            return
+        cache = caches[self.cache_alias]
+        for view, local in counts.items():
+            # Concurrent flushes from other processes may lose an increment
+            # now and then, which is fine for picking popular queries
+            stored = Counter(cache.get(self.cache_key(view)) or {})
+            stored.update(local)
+            cache.set(self.cache_key(view), dict(self._trim(stored)), self.timeout)
+
+    def top_queries(self, view: str, limit: int) -> List[str]:
+        """The `limit` most frequently recorded queries for view."""
+        stored = Counter(caches[self.cache_alias].get(self.cache_key(view)) or {})
+        return [query for query, _ in stored.most_common(limit)]
+
+    def clear(self, view: str) -> None:
+        with self._lock:
+            self._counts.pop(view, None)
+        caches[self.cache_alias].delete(self.cache_key(view))
+
+
+recorder = QueryRecorder()
@@ -0,0 +1,142 @@
+"""
+Database routing for autocomplete reads.
+
+Views and fields take a `using` option: None reads from the database Django's
+routers pick, as before; an alias reads from that database; and a list of
+aliases or a ReplicaPool spreads reads over read replicas round-robin. A
+replica whose connection fails is skipped for `retry_after` seconds and the
+read is retried on the next one, or on the primary once none are left.
+
+Replicas lag behind the primary, so lookups that must see just-written rows
+(validating a key that was created a moment ago) retry misses on the primary,
+see run_read().
+"""
+
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, router
+from django.db.models import QuerySet
+
+T = TypeVar('T')
+
+
+class ReplicaPool:
+    """Round-robin over read replica aliases, skipping those that recently failed."""
+
+    def __init__(self, aliases: Sequence[str], primary: str = DEFAULT_DB_ALIAS,
+                 retry_after: float = 30.0) -> None:
+        self.aliases = tuple(aliases)
+        self.primary = primary
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(self.aliases)
+        self._down_until: Dict[str, float] = {}
+
+    def is_healthy(self, alias: str) -> bool:
+        return self._down_until.get(alias, 0.0) <= time.monotonic()
+
+    def healthy(self) -> List[str]:
+        return [alias for alias in self.aliases if self.is_healthy(alias)]
+
+    def choose(self) -> str:
+        """The next healthy replica, or the primary if there is none."""
+        with self._lock:
+            for _ in range(len(self.aliases)):
+                alias = next(self._cycle)
+                if self.is_healthy(alias):
+                    return alias
+        return self.primary
+
+    def mark_down(self, alias: str) -> None:
+        with self._lock:
+            self._down_until[alias] = time.monotonic() + self.retry_after
+
+    def mark_up(self, alias: str) -> None:
+        with self._lock:
+            self._down_until.pop(alias, None)
+
+    def run(self, fn: Callable[[str], T]) -> T:
+        """
+        Return fn(alias) for the next healthy replica. When a replica fails
+        with a connection error it is marked down and fn is retried on the
+        next one, ending with the primary, whose errors are raised.
+        """
+        while True:
+            alias = self.choose()
+            try:
+                return fn(alias)
+            except (OperationalError, InterfaceError):
+                if alias == self.primary:
+                    raise
+                self.mark_down(alias)
+
+
+Using = Union[None, str, Sequence[str], ReplicaPool]
+
+_pools: Dict[Tuple[str, ...], ReplicaPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(using: Using) -> Optional[ReplicaPool]:
+    """
+    The pool for a `using` option, or None if it names a single database.
+    Pools given as lists of aliases are shared process-wide, so every view
+    and field using the same replicas shares their health.
+    """
+    if isinstance(using, ReplicaPool):
+        return using
+    if using is None or isinstance(using, str):
+        return None
+    aliases = tuple(using)
+    with _pools_lock:
+        if aliases not in _pools:
+            _pools[aliases] = ReplicaPool(aliases)
+        return _pools[aliases]
+
+
+def choose_alias(using: Using, queryset: Optional[QuerySet] = None) -> str:
+    """The database to read from for a `using` option."""
+    pool = get_pool(using)
+    if pool is not None:
+        return pool.choose()
+    if using is not None:
+        return using
+    return queryset.db if queryset is not None else DEFAULT_DB_ALIAS
+
+
+def primary_alias(using: Using, queryset: QuerySet) -> str:
+    """The database holding the latest writes for queryset's model."""
+    pool = get_pool(using)
+    if pool is not None:
+        return pool.primary
+    return router.db_for_write(queryset.model)
+
+
+def run_read(using: Using, queryset: QuerySet, fn: Callable[[QuerySet], T],
+             retry_on_primary: Tuple[Type[BaseException], ...] = ()) -> T:
+    """
+    Return fn(queryset) with queryset reading from the database `using`
+    selects, failing over between replicas. fn must evaluate the queryset.
+    If fn raises one of retry_on_primary (e.g. DoesNotExist) on a replica,
+    the row may just not have been replicated yet, so fn is retried on the
+    primary.
+    """
+    used = []
+
+    def read(alias: str) -> T:
+        used.append(alias)
+        return fn(queryset.using(alias))
+
+    try:
+        pool = get_pool(using)
+        if pool is not None:
+            return pool.run(read)
+        return read(using if using is not None else queryset.db)
+    except retry_on_primary:
+        primary = primary_alias(using, queryset)
+        if used[-1] == primary:
+            raise
+        return fn(queryset.using(primary))
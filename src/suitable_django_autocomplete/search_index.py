@@ -0,0 +1,208 @@
+"""
+Denormalized search index for model autocomplete.
+
+Register a SearchIndex to keep one SearchEntry row per object in sync with
+the source model through post_save/post_delete signals:
+
+    from suitable_django_autocomplete.search_index import SearchIndex, register
+
+    @register
+    class EmployeeIndex(SearchIndex):
+        name = 'employees'
+        model = Employee
+        search_fields = ['user__username', 'company__name']
+
+and point a view at it with ``search_index = 'employees'``. Run the
+``rebuild_search_index`` management command to fill the index initially and
+after bulk updates, which bypass signals. Changes to related objects (a
+renamed company) are only picked up by saving the indexed object or by a
+rebuild.
+
+Every word of the search text is also stored as a SearchToken, and a query
+matches entries with a word starting with each of its words. Those lookups
+are range scans of the (index, token) B-tree index. Set match_substrings to
+match anywhere in the text instead; that is a LIKE '%...%' scan of all the
+index's entries, which only a trigram index (pg_trgm on PostgreSQL, created
+by you) can speed up.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from django.db import transaction
+from django.db.models import Case, CharField, IntegerField, QuerySet, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save
+
+from .fuzzy import normalize
+from .models import SearchEntry, SearchToken
+from .ranking import EXACT, PREFIX, SUBSTRING, WORD_PREFIX
+
+registry: Dict[str, 'SearchIndex'] = {}
+
+
+def resolve_field(obj: Any, path: str) -> Any:
+    """Follow a (possibly related, e.g. 'user__username') field path on obj."""
+    value = obj
+    for part in path.split('__'):
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+class SearchIndex:
+    """Describes which objects are indexed and how their search text is built."""
+    name: str = ''
+    model: Optional[type] = None
+    search_fields: List[str] = []
+    batch_size: int = 1000
+    match_substrings: bool = False
+
+    def get_queryset(self) -> QuerySet:
+        """Objects that belong in the index. Override to add custom filtering."""
+        queryset = self.model._default_manager.all()
+        related = sorted({field.rsplit('__', 1)[0] for field in self.search_fields if '__' in field})
+        return queryset.select_related(*related) if related else queryset
+
+    def get_label(self, obj: Any) -> str:
+        """Display label, taken from the first search field."""
+        value = resolve_field(obj, self.search_fields[0]) if self.search_fields else None
+        return str(value if value is not None else obj)[:255]
+
+    def get_search_text(self, obj: Any) -> str:
+        """Normalized text the query is matched against."""
+        values = (resolve_field(obj, field) for field in self.search_fields)
+        return normalize(' '.join(str(value) for value in values if value not in (None, '')))[:500]
+
+    def build_tokens(self, entry: SearchEntry) -> List[SearchToken]:
+        """One token per distinct word of the entry's search text."""
+        words = sorted({word[:100] for word in entry.search_text.split()})
+        return [SearchToken(index=self.name, object_id=entry.object_id, token=word) for word in words]
+
+    def build_entry(self, obj: Any) -> SearchEntry:
+        return SearchEntry(
+            index=self.name,
+            object_id=str(obj.pk),
+            label=self.get_label(obj),
+            search_text=self.get_search_text(obj),
+        )
+
+    def update_object(self, obj: Any) -> None:
+        """Add, refresh or remove the entry for a single object."""
+        instance = self.get_queryset().filter(pk=obj.pk).first()
+        if instance is None:
+            self.remove_object(obj)
+            return
+        entry = self.build_entry(instance)
+        with transaction.atomic():
+            SearchEntry.objects.update_or_create(
+                index=self.name, object_id=entry.object_id,
+                defaults={'label': entry.label, 'search_text': entry.search_text},
+            )
+            SearchToken.objects.filter(index=self.name, object_id=entry.object_id).delete()
+            SearchToken.objects.bulk_create(self.build_tokens(entry))
+
+    def remove_object(self, obj: Any) -> None:
+        with transaction.atomic():
+            SearchEntry.objects.filter(index=self.name, object_id=str(obj.pk)).delete()
+            SearchToken.objects.filter(index=self.name, object_id=str(obj.pk)).delete()
+
+    def iter_entries(self) -> Iterator[SearchEntry]:
+        for obj in self.get_queryset().iterator(chunk_size=self.batch_size):
+            yield self.build_entry(obj)
+
+    def rebuild(self) -> int:
+        """Replace every entry of this index. Returns the number of entries."""
+        count = 0
+        with transaction.atomic():
+            SearchEntry.objects.filter(index=self.name).delete()
+            SearchToken.objects.filter(index=self.name).delete()
+            batch: List[SearchEntry] = []
+            for entry in self.iter_entries():
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    count += self._create_batch(batch)
+                    batch = []
+            if batch:
+                count += self._create_batch(batch)
+        return count
+
+    def _create_batch(self, entries: List[SearchEntry]) -> int:
+        SearchEntry.objects.bulk_create(entries)
+        SearchToken.objects.bulk_create(
+            [token for entry in entries for token in self.build_tokens(entry)],
+            batch_size=self.batch_size,
+        )
+        return len(entries)
+
+    def search(self, query: str, limit: int = 20, ranked: bool = True,
+               using: Optional[str] = None, scope: Optional[QuerySet] = None) -> List[Tuple[str, str]]:
+        """
+        Return (object_id, label) pairs with a word starting with each word of
+        the query, or whose search text contains the query if match_substrings
+        is set. With scope, only entries for objects in that queryset of the
+        indexed model are returned.
+        """
+        term = ' '.join(normalize(query).split())
+        if not term:
+            return []
+        entries = SearchEntry.objects.db_manager(using).filter(index=self.name)
+        if scope is not None:
+            object_ids = scope.order_by().values(object_pk=Cast('pk', output_field=CharField()))
+            entries = entries.filter(object_id__in=object_ids)
+        if self.match_substrings:
+            entries = entries.filter(search_text__contains=term)
+        else:
+            tokens = SearchToken.objects.db_manager(using).filter(index=self.name)
+            for word in term.split():
+                word = word[:100]
+                # The range is what the (index, token) index serves;
+                # startswith keeps the match exact under any collation
+                matching = tokens.filter(token__gte=word, token__lt=word + '\U0010ffff',
+                                         token__startswith=word)
+                entries = entries.filter(object_id__in=matching.values('object_id'))
+        if ranked:
+            entries = entries.annotate(autocomplete_relevance=Case(
+                When(search_text=term, then=Value(EXACT)),
+                When(search_text__startswith=term, then=Value(PREFIX)),
+                When(search_text__contains=f' {term}', then=Value(WORD_PREFIX)),
+                default=Value(SUBSTRING),
+                output_field=IntegerField(),
+            )).order_by('-autocomplete_relevance', 'label')
+        return list(entries.values_list('object_id', 'label')[:limit])
+
+    def handle_save(self, sender: type, instance: Any, raw: bool = False, **kwargs: Any) -> None:
+        if not raw:
+            self.update_object(instance)
+
+    def handle_delete(self, sender: type, instance: Any, **kwargs: Any) -> None:
+        self.remove_object(instance)
+
+
+def register(index_class: Type[SearchIndex]) -> Type[SearchIndex]:
+    """Register an index and connect its signals. Usable as a class decorator."""
+    index = index_class()
+    if not index.name:
+        index.name = index.model._meta.label_lower
+    if index.name in registry:
+        raise ValueError(f"A search index named '{index.name}' is already registered")
+    registry[index.name] = index
+    post_save.connect(index.handle_save, sender=index.model,
+                      dispatch_uid=f'suitable_django_autocomplete.save.{index.name}')
+    post_delete.connect(index.handle_delete, sender=index.model,
+                        dispatch_uid=f'suitable_django_autocomplete.delete.{index.name}')
+    return index_class
+
+
+def unregister(name: str) -> None:
+    """Remove an index from the registry and disconnect its signals."""
+    index = registry.pop(name)
+    post_save.disconnect(sender=index.model, dispatch_uid=f'suitable_django_autocomplete.save.{name}')
+    post_delete.disconnect(sender=index.model, dispatch_uid=f'suitable_django_autocomplete.delete.{name}')
+
+
+def get_index(name: str) -> SearchIndex:
+    try:
+        return registry[name]
+    except KeyError:
+        raise LookupError(f"No search index named '{name}' is registered") from None
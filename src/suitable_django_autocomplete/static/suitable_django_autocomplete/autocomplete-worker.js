@@ -0,0 +1,170 @@
+// Off-main-thread search index for <autocomplete-input data-source="...">.
+//
+// One worker is created per data source URL and label field, and shared by
+// every element that points at it. The dataset is fetched once, normalised, and indexed by
+// prefix (first PREFIX_LENGTH characters of every word) and by trigram, so a
+// query only ever scans a small candidate list instead of the whole dataset.
+
+const PREFIX_LENGTH = 3;
+const NGRAM_SIZE = 3;
+
+let items = [];          // raw items as delivered by the data source
+let labels = [];         // normalised label per item
+let prefixIndex = new Map();
+let ngramIndex = new Map();
+let ready = false;
+
+// Latest pending query per client. A newer query from the same client
+// replaces the older one before it is processed, which is how superseded
+// queries get cancelled.
+const pending = new Map();
+let flushScheduled = false;
+
+function normalize(text) {
+    return String(text)
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase();
+}
+
+function addToIndex(index, key, id) {
+    let bucket = index.get(key);
+    if (!bucket) {
+        bucket = [];
+        index.set(key, bucket);
+    }
+    // Ids are added in ascending order, so checking the tail is enough
+    if (bucket[bucket.length - 1] !== id) {
+        bucket.push(id);
+    }
+}
+
+function buildIndex(data, labelField) {
+    items = data;
+    labels = new Array(data.length);
+    prefixIndex = new Map();
+    ngramIndex = new Map();
+
+    for (let id = 0; id < data.length; id++) {
+        const item = data[id];
+        const raw = typeof item === 'string'
+            ? item
+            : (item[labelField] ?? item.label ?? item.name ?? item.value ?? '');
+        const label = normalize(raw);
+        labels[id] = label;
+
+        for (const word of label.split(/\s+/)) {
+            for (let n = 1; n <= Math.min(PREFIX_LENGTH, word.length); n++) {
+                addToIndex(prefixIndex, word.slice(0, n), id);
+            }
+        }
+        for (let i = 0; i + NGRAM_SIZE <= label.length; i++) {
+            addToIndex(ngramIndex, label.slice(i, i + NGRAM_SIZE), id);
+        }
+    }
+    ready = true;
+}
+
+function candidatesFor(query) {
+    // Queries shorter than a trigram only match at the start of a word;
+    // matching them anywhere would mean scanning the whole dataset.
+    if (query.length < NGRAM_SIZE) {
+        return prefixIndex.get(query) || [];
+    }
+    // Longer queries: every match contains all of the query's trigrams, so
+    // the rarest trigram's postings are a complete candidate list
+    let smallest = null;
+    for (let i = 0; i + NGRAM_SIZE <= query.length; i++) {
+        const bucket = ngramIndex.get(query.slice(i, i + NGRAM_SIZE));
+        if (!bucket) {
+            return [];
+        }
+        if (!smallest || bucket.length < smallest.length) {
+            smallest = bucket;
+        }
+    }
+    return smallest;
+}
+
+function search(rawQuery, limit) {
+    const query = normalize(rawQuery);
+    const exact = [];
+    const prefix = [];
+    const substring = [];
+
+    for (const id of candidatesFor(query)) {
+        const label = labels[id];
+        const position = label.indexOf(query);
+        if (position === -1) {
+            continue;
+        }
+        if (label === query) {
+            exact.push(id);
+        } else if (position === 0) {
+            if (prefix.length < limit) {
+                prefix.push(id);
+            }
+        } else if (substring.length < limit) {
+            substring.push(id);
+        }
+        // An exact match can come after any number of prefix matches, so
+        // only a full list of exact matches ends the scan early
+        if (exact.length >= limit) {
+            break;
+        }
+    }
+    return exact.concat(prefix, substring).slice(0, limit).map(id => items[id]);
+}
+
+function flush() {
+    flushScheduled = false;
+    for (const [clientId, request] of pending) {
+        self.postMessage({
+            type: 'results',
+            clientId,
+            queryId: request.queryId,
+            results: search(request.query, request.limit),
+        });
+    }
+    pending.clear();
+}
+
+function scheduleFlush() {
+    if (!flushScheduled && ready) {
+        flushScheduled = true;
+        setTimeout(flush, 0);
+    }
+}
+
+self.addEventListener('message', async (event) => {
+    const message = event.data;
+
+    switch (message.type) {
+        case 'load':
+            try {
+                // An absolute URL, resolved against the page by SearchWorker
+                const response = await fetch(message.source, {
+                    headers: { 'Accept': 'application/json' }
+                });
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                const data = await response.json();
+                buildIndex(Array.isArray(data) ? data : (data.results || []), message.labelField);
+                self.postMessage({ type: 'ready', size: items.length });
+                scheduleFlush();
+            } catch (error) {
+                self.postMessage({ type: 'error', message: String(error.message || error) });
+            }
+            break;
+
+        case 'query':
+            pending.set(message.clientId, message);
+            scheduleFlush();
+            break;
+
+        case 'cancel':
+            pending.delete(message.clientId);
+            break;
+    }
+});
@@ -1,3 +1,81 @@
+// One search worker per data source URL and label field, shared by every
+// element using them
+const searchWorkers = new Map();
+
+class SearchWorker {
+    constructor(source, labelField) {
+        this.clients = new Map();
+        this.ready = false;
+        this.error = null;
+        this.worker = new Worker(new URL('./autocomplete-worker.js', import.meta.url));
+        this.worker.addEventListener('message', (e) => this.handleMessage(e.data));
+        this.worker.postMessage({ type: 'load', source, labelField });
+    }
+
+    static for(source, labelField) {
+        // The worker would resolve a relative URL against its own script,
+        // so resolve it against the page here. Keying on the absolute URL
+        // also shares the worker between spellings of the same file
+        source = new URL(source, document.baseURI).href;
+        // The index is built on the label field, so elements only share a
+        // worker when they use the same one
+        const key = JSON.stringify([source, labelField]);
+        if (!searchWorkers.has(key)) {
+            searchWorkers.set(key, new SearchWorker(source, labelField));
+        }
+        return searchWorkers.get(key);
+    }
+
+    handleMessage(message) {
+        switch (message.type) {
+            case 'ready':
+                this.ready = true;
+                break;
+            case 'error':
+                this.error = message.message;
+                this.clients.forEach(client => client.handleWorkerError(message.message));
+                break;
+            case 'results': {
+                const client = this.clients.get(message.clientId);
+                if (client) {
+                    client.handleWorkerResults(message.queryId, message.results);
+                }
+                break;
+            }
+        }
+    }
+
+    register(clientId, client) {
+        this.clients.set(clientId, client);
+    }
+
+    unregister(clientId) {
+        this.clients.delete(clientId);
+        this.worker.postMessage({ type: 'cancel', clientId });
+    }
+
+    query(clientId, queryId, query, limit) {
+        // Replaces any pending query from the same client inside the worker
+        this.worker.postMessage({ type: 'query', clientId, queryId, query, limit });
+    }
+}
+
+// One observer hydrates every lazy="visible" element as it scrolls into view
+let hydrationObserver = null;
+
+function lazyObserver() {
+    if (!hydrationObserver) {
+        hydrationObserver = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    entry.target.hydrate();
+                }
+            });
+        }, { rootMargin: '200px' });
+    }
+    return hydrationObserver;
+}
+
 class AutocompleteInput extends HTMLElement {
     static formAssociated = true;
     
@@ -12,15 +90,62 @@ class AutocompleteInput extends HTMLElement {
         this.valueField = this.getAttribute('data-value-field') || 'value';
         this.labelField = this.getAttribute('data-label-field') || 'label';
         this.originalPlaceholder = '';
+        this.queryId = 0;
+        this.searchWorker = null;
+        this.activeRequest = null;
+        this.multiple = this.hasAttribute('multiple');
+        this.selectedItems = [];
+        this.hydrated = false;
         
         this._internals = this.attachInternals();
         
         this.input = this.shadowRoot.querySelector('input');
         this.resultsContainer = this.shadowRoot.querySelector('.results');
+        this.chipsContainer = this.shadowRoot.querySelector('.chips');
+        
+        // Setting the form value is all a lazy element does up front, so
+        // forms submit correctly whether or not it was ever touched
+        this.handleInitialValue();
+        
+        const lazy = this.getAttribute('lazy');
+        if (lazy === null) {
+            this.hydrate();
+        } else {
+            this.deferHydration(lazy);
+        }
+    }
+    
+    deferHydration(mode) {
+        this.hydrateOnInteraction = () => this.hydrate();
+        // focusin is composed, so focusing the inner input reaches the host
+        this.addEventListener('focusin', this.hydrateOnInteraction);
+        this.addEventListener('pointerdown', this.hydrateOnInteraction);
+        
+        if (mode === 'visible' && typeof IntersectionObserver !== 'undefined') {
+            lazyObserver().observe(this);
+        }
+    }
+    
+    hydrate() {
+        if (this.hydrated) {
+            return;
+        }
+        this.hydrated = true;
+        
+        if (this.hydrateOnInteraction) {
+            this.removeEventListener('focusin', this.hydrateOnInteraction);
+            this.removeEventListener('pointerdown', this.hydrateOnInteraction);
+            this.hydrateOnInteraction = null;
+        }
+        if (hydrationObserver) {
+            hydrationObserver.unobserve(this);
+        }
         
         // Store original placeholder
         this.originalPlaceholder = this.input.getAttribute('placeholder') || '';
         
+        this.setupAccessibility();
+        
         // hoist aria from host → internal input for naming & description
         const ariaLabel = this.getAttribute('aria-label');
         const ariaLabelledBy = this.getAttribute('aria-labelledby');
@@ -35,9 +160,7 @@ class AutocompleteInput extends HTMLElement {
         describedByIds.push(this.statusId);
         this.input.setAttribute('aria-describedby', describedByIds.join(' '));
 
-        this.setupAccessibility();
         this.setupEventListeners();
-        this.handleInitialValue();
     }
     
     setupAccessibility() {
@@ -72,7 +195,7 @@ class AutocompleteInput extends HTMLElement {
         this.input.addEventListener('input', (e) => {
             this.handleInput(e.target.value);
             // Clear selected item if user types manually
-            if (this.selectedItem && e.target.value !== this.getItemLabel(this.selectedItem)) {
+            if (!this.multiple && this.selectedItem && e.target.value !== this.getItemLabel(this.selectedItem)) {
                 this.selectedItem = null;
                 this.updateFormValue('');
             }
@@ -87,6 +210,10 @@ class AutocompleteInput extends HTMLElement {
         });
         
         this.input.addEventListener('keydown', (e) => {
+            // Backspace in an empty input removes the last chip
+            if (this.multiple && e.key === 'Backspace' && !this.input.value && this.selectedItems.length) {
+                this.removeItem(this.selectedItems.length - 1);
+            }
             this.handleKeyDown(e);
             
             // Propagate keydown event to host element
@@ -130,6 +257,11 @@ class AutocompleteInput extends HTMLElement {
             
             setTimeout(() => {
                 this.hideResults();
+                // Unfinished text is never a value in multiple mode
+                if (this.multiple) {
+                    this.input.value = '';
+                    return;
+                }
                 // Clear value if no valid selection
                 if (!this.selectedItem && this.input.value) {
                     this.input.value = '';
@@ -139,27 +271,104 @@ class AutocompleteInput extends HTMLElement {
         });
         
         
-        document.addEventListener('click', (e) => {
+        this.handleDocumentClick = (e) => {
             if (!this.contains(e.target)) {
                 this.hideResults();
             }
-        });
+        };
+        document.addEventListener('click', this.handleDocumentClick);
+    }
+    
+    connectedCallback() {
+        if (this.handleDocumentClick) {
+            document.addEventListener('click', this.handleDocumentClick);
+        }
+    }
+    
+    disconnectedCallback() {
+        if (this.handleDocumentClick) {
+            document.removeEventListener('click', this.handleDocumentClick);
+        }
+        if (hydrationObserver) {
+            hydrationObserver.unobserve(this);
+        }
+        if (this.searchWorker) {
+            this.searchWorker.unregister(this.inputId);
+            this.searchWorker = null;
+        }
+    }
+    
+    getSearchWorker() {
+        const source = this.getAttribute('data-source');
+        if (!source || typeof Worker === 'undefined') {
+            return null;
+        }
+        if (!this.searchWorker) {
+            this.searchWorker = SearchWorker.for(source, this.labelField);
+            this.searchWorker.register(this.inputId, this);
+        }
+        return this.searchWorker;
+    }
+    
+    searchLocal(worker, query) {
+        if (worker.error) {
+            this.handleWorkerError(worker.error);
+            return;
+        }
+        this.queryId += 1;
+        if (!worker.ready) {
+            this.showLoading();
+        }
+        const limit = parseInt(this.getAttribute('data-limit'), 10) || 20;
+        worker.query(this.inputId, this.queryId, query, limit);
+    }
+    
+    handleWorkerResults(queryId, results) {
+        // Drop answers to queries the user has already typed past
+        if (queryId !== this.queryId) {
+            return;
+        }
+        this.renderResults(results);
+    }
+    
+    handleWorkerError(message) {
+        console.error('Search worker error:', message);
+        this.showError('Failed to load suggestions');
     }
     
     handleInput(value) {
         clearTimeout(this.debounceTimeout);
         
         if (value.length < this.minLength) {
+            // Invalidate any local query or request still in flight
+            this.queryId += 1;
+            if (this.activeRequest) {
+                this.activeRequest.abort();
+                this.activeRequest = null;
+            }
             this.hideResults();
             return;
         }
         
+        // Local searches run off the main thread and cost no requests,
+        // so they don't need debouncing
+        if (this.hasAttribute('data-source')) {
+            this.fetchResults(value);
+            return;
+        }
+        
         this.debounceTimeout = setTimeout(() => {
             this.fetchResults(value);
         }, this.debounceDelay);
     }
     
     async fetchResults(query) {
+        const worker = this.getSearchWorker();
+        if (worker) {
+            this.searchLocal(worker, query);
+            return;
+        }
+        
         const endpoint = this.getAttribute('endpoint');
         if (!endpoint) {
             console.error('No endpoint attribute specified');
@@ -167,9 +376,15 @@ class AutocompleteInput extends HTMLElement {
             return;
         }
         
-        // Create abort controller for timeout
+        // Create abort controller for timeout, and to cancel this request
+        // once a newer one supersedes it
         const controller = new AbortController();
-        const timeoutId = setTimeout(() => controller.abort(), 10000); // 10 second timeout
+        if (this.activeRequest) {
+            this.activeRequest.abort();
+        }
+        this.activeRequest = controller;
+        const timeout = parseInt(this.getAttribute('data-timeout'), 10) || 10000;
+        const timeoutId = setTimeout(() => controller.abort(), timeout);
         
         try {
             this.showLoading();
@@ -180,17 +395,26 @@ class AutocompleteInput extends HTMLElement {
             const response = await fetch(url, {
                 signal: controller.signal,
                 headers: {
-                    'Accept': 'application/json',
+                    // Views with streaming enabled answer with NDJSON chunks
+                    'Accept': 'application/x-ndjson, application/json',
                     'X-Requested-With': 'XMLHttpRequest'
                 }
             });
             
-            clearTimeout(timeoutId);
-            
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
+            const contentType = response.headers.get('Content-Type') || '';
+            if (contentType.includes('application/x-ndjson') && response.body) {
+                // The timeout keeps running until the last chunk is in
+                await this.readStream(response);
+                clearTimeout(timeoutId);
+                return;
+            }
+            
+            clearTimeout(timeoutId);
+            
             const data = await response.json();
             
             // Validate response structure
@@ -200,9 +424,19 @@ class AutocompleteInput extends HTMLElement {
             
             this.renderResults(data.results || []);
             
+            // The server ran out of time and sent a reduced result set
+            if (data.partial) {
+                this.showPartialStatus();
+            }
+            
         } catch (error) {
             clearTimeout(timeoutId);
             
+            if (controller !== this.activeRequest) {
+                // Superseded by a newer request, which renders instead
+                return;
+            }
+            
             if (error.name === 'AbortError') {
                 console.error('Request timeout');
                 this.showError('Request timed out. Please try again.');
@@ -219,6 +453,61 @@ class AutocompleteInput extends HTMLElement {
         }
     }
     
+    async readStream(response) {
+        // One JSON object per line: cheap matches first, more in later
+        // lines, and a final line with "done": true
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let rendered = false;
+        
+        const handleLine = (line) => {
+            if (!line.trim()) {
+                return;
+            }
+            const chunk = JSON.parse(line);
+            const results = chunk.results || [];
+            if (results.length) {
+                if (rendered) {
+                    this.appendResults(results);
+                } else {
+                    this.renderResults(results);
+                    rendered = true;
+                }
+            }
+            if (chunk.done) {
+                if (!rendered) {
+                    this.renderResults([]);
+                    rendered = true;
+                }
+                if (chunk.partial) {
+                    this.showPartialStatus();
+                }
+            }
+        };
+        
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+        if (!rendered) {
+            this.renderResults([]);
+        }
+    }
+    
+    showPartialStatus() {
+        if (this.results.length > 0) {
+            this.updateStatus(`${this.results.length} suggestion${this.results.length !== 1 ? 's' : ''} available (partial results)`);
+        }
+    }
+    
     showLoading() {
         this.resultsContainer.innerHTML = '<div class="loading">Loading...</div>';
         this.showResults();
@@ -244,23 +533,9 @@ class AutocompleteInput extends HTMLElement {
             return;
         }
 
-        // build options ⬇
-        const html = results.map((result, index) => {
-            const displayText = this.getItemLabel(result);
-            const optionId    = `${this.listboxId}-option-${index}`;
-            return `<div class="result-item"
-                         role="option"
-                         id="${optionId}"
-                         data-index="${index}"
-                         tabindex="-1"
-                         aria-selected="false">${this.escapeHtml(displayText)}</div>`;
-        }).join('');
-
-        this.resultsContainer.innerHTML = html;
-
-        this.resultsContainer.querySelectorAll('.result-item')
-            .forEach((item, index) => item.addEventListener('click',
-                () => this.selectResultByIndex(index)));
+        this.resultsContainer.innerHTML = results
+            .map((result, index) => this.renderOption(result, index)).join('');
+        this.bindOptions(0);
 
         this.showResults();
 
@@ -268,11 +543,60 @@ class AutocompleteInput extends HTMLElement {
         this.updateStatus(`${this.results.length} suggestion${this.results.length !== 1 ? 's' : ''} available`);
     }
 
+    appendResults(results) {
+        // Later chunks of a streamed response may repeat earlier values
+        const seen = new Set(this.results.map(item => String(this.getItemValue(item))));
+        const added = results.filter(item => {
+            const value = String(this.getItemValue(item));
+            if (seen.has(value)) {
+                return false;
+            }
+            seen.add(value);
+            return true;
+        });
+        if (added.length === 0) {
+            return;
+        }
+
+        // Appending leaves the active option where it is
+        const start = this.results.length;
+        this.results = this.results.concat(added);
+        this.resultsContainer.insertAdjacentHTML('beforeend', added
+            .map((result, offset) => this.renderOption(result, start + offset)).join(''));
+        this.bindOptions(start);
+
+        this.updateStatus(`${this.results.length} suggestion${this.results.length !== 1 ? 's' : ''} available`);
+    }
+
+    renderOption(result, index) {
+        const displayText = this.getItemLabel(result);
+        const optionId    = `${this.listboxId}-option-${index}`;
+        return `<div class="result-item"
+                     role="option"
+                     id="${optionId}"
+                     data-index="${index}"
+                     tabindex="-1"
+                     aria-selected="false">${this.escapeHtml(displayText)}</div>`;
+    }
+
+    bindOptions(start) {
+        this.resultsContainer.querySelectorAll('.result-item')
+            .forEach((item, index) => {
+                if (index >= start) {
+                    item.addEventListener('click', () => this.selectResultByIndex(index));
+                }
+            });
+    }
+
     
     selectResultByIndex(index) {
         console.log("selectResultByIndex", index)
         if (index >= 0 && index < this.results.length) {
             const item = this.results[index];
+            if (this.multiple) {
+                this.addItem(item);
+                return;
+            }
             this.selectedItem = item;
             const label = this.getItemLabel(item);
             const value = this.getItemValue(item);
@@ -296,6 +620,79 @@ class AutocompleteInput extends HTMLElement {
         this._internals.setFormValue(value);
     }
     
+    addItem(item) {
+        const value = this.getItemValue(item);
+        const label = this.getItemLabel(item);
+        if (!this.selectedItems.some(selected => this.getItemValue(selected) === value)) {
+            this.selectedItems.push(item);
+            this.syncMultipleValue();
+        }
+        this.input.value = '';
+        this.hideResults();
+        this.input.focus();
+        
+        this.dispatchEvent(new CustomEvent('autocomplete-select', {
+            detail: { value, label, item },
+            bubbles: true
+        }));
+        this.dispatchEvent(new Event('change', {
+            bubbles: true,
+            cancelable: true
+        }));
+    }
+    
+    removeItem(index) {
+        const [item] = this.selectedItems.splice(index, 1);
+        this.syncMultipleValue();
+        this.updateStatus(`${this.getItemLabel(item)} removed`);
+        this.dispatchEvent(new CustomEvent('autocomplete-remove', {
+            detail: { value: this.getItemValue(item), label: this.getItemLabel(item), item },
+            bubbles: true
+        }));
+        this.dispatchEvent(new Event('change', {
+            bubbles: true,
+            cancelable: true
+        }));
+    }
+    
+    syncMultipleValue() {
+        // One form entry per selected value, like a <select multiple>
+        const data = new FormData();
+        this.selectedItems.forEach(item => data.append(this.name, this.getItemValue(item)));
+        this._internals.setFormValue(this.selectedItems.length ? data : null);
+        this.renderChips();
+    }
+    
+    renderChips() {
+        if (!this.chipsContainer) {
+            return;
+        }
+        // Built with DOM APIs: labels can contain quotes and markup, which
+        // must never end up inside an attribute or the HTML
+        this.chipsContainer.replaceChildren(...this.selectedItems.map((item, index) => {
+            const label = this.getItemLabel(item);
+            const chip = document.createElement('span');
+            chip.className = 'chip';
+            chip.setAttribute('part', 'chip');
+            chip.textContent = label;
+            
+            const remove = document.createElement('button');
+            remove.type = 'button';
+            remove.className = 'chip-remove';
+            remove.setAttribute('part', 'chip-remove');
+            remove.setAttribute('aria-label', `Remove ${label}`);
+            remove.textContent = '\u00d7';
+            remove.addEventListener('click', (e) => {
+                e.stopPropagation();
+                this.removeItem(index);
+                this.input.focus();
+            });
+            
+            chip.appendChild(remove);
+            return chip;
+        }));
+    }
+    
     get name() {
         return this.getAttribute('name');
     }
@@ -427,10 +824,23 @@ class AutocompleteInput extends HTMLElement {
     escapeHtml(text) {
         const div = document.createElement('div');
         div.textContent = text;
-        return div.innerHTML;
+        // innerHTML leaves quotes alone; escape them so the result is safe
+        // inside attribute values too
+        return div.innerHTML.replace(/"/g, '&quot;').replace(/'/g, '&#39;');
     }
     
     handleInitialValue() {
+        if (this.multiple) {
+            try {
+                this.selectedItems = JSON.parse(this.getAttribute('data-initial-items') || '[]');
+            } catch (error) {
+                console.error('Invalid data-initial-items:', error);
+                this.selectedItems = [];
+            }
+            this.syncMultipleValue();
+            return;
+        }
+        
         const initialValue = this.getAttribute('value');
         const displayValue = this.getAttribute('data-display-value');
         
@@ -449,10 +859,19 @@ class AutocompleteInput extends HTMLElement {
     
     // Override value getter/setter to handle initial binding
     get value() {
+        if (this.multiple) {
+            return this.selectedItems.map(item => this.getItemValue(item));
+        }
         return this.selectedItem ? this.getItemValue(this.selectedItem) : '';
     }
     
     set value(val) {
+        if (this.multiple) {
+            const values = Array.isArray(val) ? val : (val ? [val] : []);
+            this.selectedItems = values.map(v => (typeof v === 'object' ? v : String(v)));
+            this.syncMultipleValue();
+            return;
+        }
         if (val) {
             // Store the initial value and try to resolve it when we get results
             this.initialValue = val;
@@ -1,15 +1,61 @@
-from typing import List, Dict, Any, Optional
-from django.http import JsonResponse, HttpRequest
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+from django.http import JsonResponse, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
 from django.views import View
 from django.views.generic.list import BaseListView
 from django.db.models import Q, QuerySet
 from django.core.serializers import serialize
 from django.utils.html import escape
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, router
+import hashlib
 import json
+import random
+import time
+
+from .coalescing import acquire_cache_lock, flights, release_cache_lock, wait_for_cache
+from .choice_index import ChoiceIndex, build_choice_index, open_choice_index
+from .columns import ChoiceColumns
+from .deadlines import QueryDeadlineExceeded, query_deadline
+from .fuzzy import FuzzyIndex
+from .ranking import match_score, relevance_expression, top_k
+from .recording import recorder
+from .routing import Using, choose_alias, get_pool
 
 
 class AutocompleteView(View):
-    """Base view for handling autocomplete requests."""
+    """
+    Base view for handling autocomplete requests.
+    
+    Set time_budget (seconds) to have the database abort queries that run
+    longer. The response then falls back to get_degraded_results() and is
+    marked "partial". The full query gets all but fallback_budget_share of
+    the budget, the fallback what is left of it. Set cache_timeout (seconds)
+    to cache complete results in the Django cache; cached results are also
+    used for degraded responses.
+    
+    Set record_sample_rate (0 to 1) to record that share of queries for the
+    warm_autocomplete_cache management command (see recording.py).
+    
+    Set coalesce to have concurrent requests for the same cache key in this
+    process share one computation (see coalescing.py). With a cache_timeout,
+    coalesce_lock_timeout (seconds) extends this across processes through a
+    lock in the cache, and cache_stale_timeout (seconds) keeps serving
+    expired results for that much longer while one request refreshes them.
+    
+    Set stream to answer clients that accept application/x-ndjson with one
+    JSON line per chunk of get_result_tiers() as soon as it is ready, so cheap
+    matches show while expensive ones are still being computed.
+    """
+    time_budget: Optional[float] = None
+    fallback_budget_share: float = 0.2
+    cache_timeout: Optional[int] = None
+    cache_alias: str = DEFAULT_CACHE_ALIAS
+    record_sample_rate: float = 0.0
+    coalesce: bool = False
+    coalesce_lock_timeout: Optional[float] = None
+    cache_stale_timeout: Optional[int] = None
+    stream: bool = False
     
     def get_results(self, query: str) -> List[Any]:
         """
@@ -18,24 +64,262 @@ class AutocompleteView(View):
         """
         raise NotImplementedError("Subclasses must implement get_results()")
     
-    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+    def get_result_tiers(self, query: str) -> Iterator[List[Any]]:
+        """
+        Results in chunks, cheapest first, for streamed responses. Chunks
+        should not repeat earlier results. Defaults to get_results() as a
+        single chunk.
+        """
+        yield self.get_results(query)
+    
+    def get_db_alias(self) -> Optional[str]:
+        """Database alias the time budget is enforced on, None if the view queries none."""
+        return DEFAULT_DB_ALIAS
+    
+    def get_view_label(self) -> str:
+        """Dotted path identifying this view in cache keys and recorded traffic."""
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+    
+    def get_cache_key(self, query: str) -> str:
+        """Cache key for the results of query. Override to add scoping (e.g. per user)."""
+        digest = hashlib.md5(query.lower().encode()).hexdigest()
+        return f"suitable_django_autocomplete:{self.get_view_label()}:{digest}"
+    
+    def get_cached_results(self, query: str) -> Optional[List[Any]]:
+        """Cached results for query, including stale ones."""
+        if self.cache_timeout is None:
+            return None
+        return caches[self.cache_alias].get(self.get_cache_key(query))
+    
+    def get_cached_entry(self, query: str) -> Tuple[Optional[List[Any]], bool]:
+        """Return (cached results or None, whether they are still fresh)."""
+        if self.cache_timeout is None:
+            return None, False
+        if self.cache_stale_timeout is None:
+            return self.get_cached_results(query), True
+        key = self.get_cache_key(query)
+        entries = caches[self.cache_alias].get_many([key, f"{key}:fresh"])
+        return entries.get(key), f"{key}:fresh" in entries
+    
+    def set_cached_results(self, query: str, results: List[Any]) -> None:
+        if self.cache_timeout is None:
+            return
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(query)
+        if self.cache_stale_timeout is None:
+            cache.set(key, results, self.cache_timeout)
+            return
+        # Results outlive their freshness marker by cache_stale_timeout
+        cache.set(key, results, self.cache_timeout + self.cache_stale_timeout)
+        cache.set(f"{key}:fresh", True, self.cache_timeout)
+    
+    def get_fallback_results(self, query: str) -> List[Any]:
+        """Cheap results to serve when the full query runs out of time. Override to customize."""
+        return []
+    
+    def get_query_budget(self) -> Optional[float]:
+        """Seconds the full query may take, leaving the rest of time_budget to the fallback."""
+        if self.time_budget is None:
+            return None
+        return self.time_budget * (1 - self.fallback_budget_share)
+    
+    def get_remaining_budget(self, started: float) -> Optional[float]:
+        """Seconds left of time_budget for a request that started at `started` (time.monotonic())."""
+        if self.time_budget is None:
+            return None
+        return max(0.0, self.time_budget - (time.monotonic() - started))
+    
+    def get_result_text(self, item: Any) -> str:
+        """Text a result is matched on when narrowing cached prefix results."""
+        if not isinstance(item, dict):
+            return str(item)
+        if 'label' in item:
+            return str(item['label'])
+        return ' '.join(str(value) for value in item.values() if value is not None)
+    
+    def get_degraded_results(self, query: str, time_budget: Optional[float] = None) -> List[Any]:
+        """
+        Results for a query that exceeded its time budget: the cached results
+        of the longest cached prefix of the query, narrowed down to the query,
+        or else get_fallback_results() if time_budget (the seconds left, or
+        None for no limit) allows.
+        """
+        if self.cache_timeout is not None and len(query) > 1:
+            prefixes = {self.get_cache_key(query[:n]): query[:n] for n in range(len(query) - 1, 0, -1)}
+            cached = caches[self.cache_alias].get_many(list(prefixes))
+            query_lower = query.lower()
+            for key in prefixes:
+                if key in cached:
+                    return [item for item in cached[key] if query_lower in self.get_result_text(item).lower()]
+        if time_budget is not None and time_budget <= 0:
+            return []
+        try:
+            with query_deadline(time_budget, using=self.get_db_alias()):
+                return self.get_fallback_results(query)
+        except QueryDeadlineExceeded:
+            return []
+    
+    def get_results_within_budget(self, query: str) -> Tuple[List[Any], bool]:
+        """Return (results, partial), enforcing time_budget and caching."""
+        cached, fresh = self.get_cached_entry(query)
+        if cached is not None:
+            if fresh:
+                return cached, False
+            # Stale: whoever takes the lock refreshes, the others keep
+            # serving the stale results in the meantime
+            cache = caches[self.cache_alias]
+            lock_key = f"{self.get_cache_key(query)}:lock"
+            token = acquire_cache_lock(cache, lock_key, self.coalesce_lock_timeout or self.cache_stale_timeout)
+            if token is None:
+                return cached, False
+            try:
+                results, partial = self.compute_results(query)
+            finally:
+                release_cache_lock(cache, lock_key, token)
+            # Stale but complete beats fresh but degraded
+            return (cached, False) if partial else (results, False)
+        
+        if not self.coalesce:
+            return self.compute_results(query)
+        return flights.do(self.get_cache_key(query), lambda: self.compute_shared_results(query))
+    
+    def compute_shared_results(self, query: str) -> Tuple[List[Any], bool]:
+        """
+        compute_results(), coalesced across processes when coalesce_lock_timeout
+        is set: one process computes while the others wait up to that long for
+        its results to show up in the cache.
+        """
+        if self.coalesce_lock_timeout is None or self.cache_timeout is None:
+            return self.compute_results(query)
+        
+        cache = caches[self.cache_alias]
+        lock_key = f"{self.get_cache_key(query)}:lock"
+        token = acquire_cache_lock(cache, lock_key, self.coalesce_lock_timeout)
+        if token is None:
+            cached = wait_for_cache(cache, lock_key, lambda: self.get_cached_results(query),
+                                    self.coalesce_lock_timeout)
+            if cached is not None:
+                return cached, False
+            # The holder timed out or degraded; compute our own results
+            return self.compute_results(query)
+        try:
+            return self.compute_results(query)
+        finally:
+            release_cache_lock(cache, lock_key, token)
+    
+    def compute_results(self, query: str) -> Tuple[List[Any], bool]:
+        """Run get_results() within the time budget and cache complete results."""
+        started = time.monotonic()
+        try:
+            with query_deadline(self.get_query_budget(), using=self.get_db_alias()):
+                results = self.get_results(query)
+        except QueryDeadlineExceeded:
+            return self.get_degraded_results(query, self.get_remaining_budget(started)), True
+        
+        self.set_cached_results(query, results)
+        return results, False
+    
+    def stream_results(self, query: str) -> Iterator[Dict[str, Any]]:
+        """
+        Chunks of a streamed response: {'results', 'query'} per result tier,
+        ending with one that has 'done': True (and 'partial': True if the
+        time budget ran out). The whole time_budget is shared by all tiers.
+        
+        Cached queries, and all queries when coalescing, are answered as one
+        chunk by get_results_within_budget(), so they share its stale refresh
+        and coalescing.
+        """
+        cached, _ = self.get_cached_entry(query)
+        if cached is not None or self.coalesce:
+            results, partial = self.get_results_within_budget(query)
+            chunk: Dict[str, Any] = {'results': results, 'query': query, 'done': True}
+            if partial:
+                chunk['partial'] = True
+            yield chunk
+            return
+        
+        yield from self.stream_tiers(query, time.monotonic())
+    
+    def stream_tiers(self, query: str, started: float) -> Iterator[Dict[str, Any]]:
+        """Chunks of get_result_tiers(), within the time budget counted from started."""
+        budget = self.get_query_budget()
+        deadline = None if budget is None else started + budget
+        tiers = self.get_result_tiers(query)
+        results: List[Any] = []
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise QueryDeadlineExceeded("Time budget spent on earlier tiers")
+                with query_deadline(remaining, using=self.get_db_alias()):
+                    chunk = next(tiers, None)
+            except QueryDeadlineExceeded:
+                # Keep what was sent; with nothing sent yet, degrade
+                chunk = [] if results else self.get_degraded_results(query, self.get_remaining_budget(started))
+                yield {'results': chunk, 'query': query, 'done': True, 'partial': True}
+                return
+            if chunk is None:
+                break
+            results += chunk
+            yield {'results': chunk, 'query': query}
+        
+        self.set_cached_results(query, results)
+        yield {'results': [], 'query': query, 'done': True}
+    
+    def wants_stream(self, request: HttpRequest) -> bool:
+        return self.stream and 'application/x-ndjson' in request.headers.get('Accept', '')
+    
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
         query: str = request.GET.get('q', '')
         
         if not query:
             return JsonResponse({'results': [], 'query': query})
         
-        results = self.get_results(query)
-        return JsonResponse({'results': results, 'query': query})
+        if self.record_sample_rate and random.random() < self.record_sample_rate:
+            recorder.record(self.get_view_label(), query)
+        
+        if self.wants_stream(request):
+            response = StreamingHttpResponse(
+                (json.dumps(chunk, cls=DjangoJSONEncoder) + '\n' for chunk in self.stream_results(query)),
+                content_type='application/x-ndjson',
+            )
+            # Ask proxies to pass chunks on as they come
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+            return response
+        
+        results, partial = self.get_results_within_budget(query)
+        data: Dict[str, Any] = {'results': results, 'query': query}
+        if partial:
+            data['partial'] = True
+        return JsonResponse(data)
 
 
 class ModelAutocompleteView(AutocompleteView):
     """
     Base view for model-based autocomplete.
     Subclasses should set model and search_fields attributes.
+    
+    Results are ranked in the database: exact matches first, then prefix,
+    word-prefix and substring matches, each multiplied by the field's weight
+    in search_weights (default 1). Set ranked = False to skip ranking.
+    
+    Set search_index to the name of a registered SearchIndex to query its
+    denormalized table instead of the model (see search_index.py). Results
+    are then limited to get_queryset() but come from the index's labels,
+    not format_result(), and match by word prefix.
+    
+    Set using to a database alias, or to a list of read replica aliases (or
+    a ReplicaPool) to spread searches over them round-robin, failing over
+    to the next replica when one is down (see routing.py).
     """
     model: Optional[type] = None
     search_fields: List[str] = []
+    search_weights: Dict[str, int] = {}
+    search_index: Optional[str] = None
+    ranked: bool = True
     limit: int = 20
+    using: Using = None
     
     def get_queryset(self) -> QuerySet:
         """Get the base queryset. Override to add custom filtering."""
@@ -49,6 +333,75 @@ class ModelAutocompleteView(AutocompleteView):
             raise NotImplementedError("ModelAutocompleteView requires search_fields attribute")
         return self.search_fields
     
+    def get_db_alias(self) -> str:
+        """Database this request searches, chosen once per request."""
+        if getattr(self, '_db_alias', None) is None:
+            if self.using is not None:
+                self._db_alias = choose_alias(self.using)
+            elif self.search_index:
+                from .models import SearchEntry
+                self._db_alias = router.db_for_read(SearchEntry)
+            else:
+                self._db_alias = self.get_queryset().db
+        return self._db_alias
+    
+    def compute_results(self, query: str) -> Tuple[List[Any], bool]:
+        pool = get_pool(self.using)
+        if pool is None:
+            return super().compute_results(query)
+        
+        def compute(alias: str) -> Tuple[List[Any], bool]:
+            self._db_alias = alias
+            return super(ModelAutocompleteView, self).compute_results(query)
+        
+        return pool.run(compute)
+    
+    def stream_tiers(self, query: str, started: float) -> Iterator[Dict[str, Any]]:
+        pool = get_pool(self.using)
+        if pool is None:
+            yield from super().stream_tiers(query, started)
+            return
+        
+        # pool.run() can't retry a generator, so fail over by hand: start
+        # again on the next replica if nothing was sent yet, otherwise end
+        # the stream with what was sent
+        sent = False
+        while True:
+            alias = self._db_alias = pool.choose()
+            try:
+                for chunk in super().stream_tiers(query, started):
+                    sent = True
+                    yield chunk
+                return
+            except (OperationalError, InterfaceError):
+                if alias != pool.primary:
+                    pool.mark_down(alias)
+                elif not sent:
+                    raise
+                if sent:
+                    yield {'results': [], 'query': query, 'done': True, 'partial': True}
+                    return
+    
+    def get_fallback_results(self, query: str) -> List[Dict[str, str]]:
+        """Unranked prefix matches on the first search field only."""
+        if self.search_index:
+            return []
+        field = self.get_search_fields()[0]
+        results = self.get_queryset().using(self.get_db_alias()).filter(**{f"{field}__istartswith": query})[:self.limit]
+        return [self.format_result(obj) for obj in results]
+    
+    def get_search_weights(self) -> Dict[str, int]:
+        """Get the relevance weight per search field. Override to customize."""
+        return self.search_weights
+    
+    def rank_queryset(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Order matches by relevance, keeping the existing ordering for ties."""
+        relevance = relevance_expression(self.get_search_fields(), query, self.get_search_weights())
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ['pk'])
+        return queryset.annotate(autocomplete_relevance=relevance).order_by(
+            '-autocomplete_relevance', *ordering
+        )
+    
     def format_result(self, obj: Any) -> Dict[str, str]:
         """
         Format a model instance for the autocomplete response.
@@ -71,40 +424,212 @@ class ModelAutocompleteView(AutocompleteView):
             'label': escape(str(label_value)),
         }
     
+    def get_index_results(self, query: str) -> List[Dict[str, str]]:
+        """Search the denormalized search index and return results."""
+        from .search_index import get_index
+        
+        # Entries cover every indexed object, so keep the view's own scoping
+        # (by tenant, request.user, ...) when get_queryset() filters
+        queryset = self.get_queryset()
+        scope = queryset if queryset.query.has_filters() else None
+        entries = get_index(self.search_index).search(query, self.limit, self.ranked,
+                                                      using=self.get_db_alias(), scope=scope)
+        return [
+            {'value': escape(object_id), 'label': escape(label)}
+            for object_id, label in entries
+        ]
+    
+    def get_search_query(self, query: str, lookup: str = 'icontains') -> Q:
+        """Q object matching query in any search field with lookup."""
+        search_query = Q()
+        for field in self.get_search_fields():
+            search_query |= Q(**{f"{field}__{lookup}": query})
+        return search_query
+    
+    def search_queryset(self, query: str, search_query: Q, limit: int,
+                        exclude: Sequence[Any] = ()) -> List[Any]:
+        """Filter, rank and limit the queryset, skipping the pks in exclude."""
+        results = self.get_queryset().using(self.get_db_alias()).filter(search_query)
+        if exclude:
+            results = results.exclude(pk__in=exclude)
+        if self.ranked:
+            results = self.rank_queryset(results, query)
+        return list(results[:limit])
+    
     def get_results(self, query: str) -> List[Dict[str, str]]:
         """Search the model and return results."""
-        queryset = self.get_queryset()
-        search_fields = self.get_search_fields()
+        if self.search_index:
+            return self.get_index_results(query)
         
-        # Build the Q object for searching
-        search_query = Q()
-        for field in search_fields:
-            search_query |= Q(**{f"{field}__icontains": query})
+        results = self.search_queryset(query, self.get_search_query(query), self.limit)
+        return [self.format_result(obj) for obj in results]
+    
+    def get_result_tiers(self, query: str) -> Iterator[List[Dict[str, str]]]:
+        """
+        Prefix matches, which can use an index, then the remaining substring
+        matches up to limit.
+        """
+        if self.search_index or type(self).get_results is not ModelAutocompleteView.get_results:
+            yield self.get_results(query)
+            return
         
-        # Filter and limit results
-        results = queryset.filter(search_query)[:self.limit]
+        prefix_matches = self.search_queryset(query, self.get_search_query(query, 'istartswith'), self.limit)
+        yield [self.format_result(obj) for obj in prefix_matches]
         
-        # Format results
-        return [self.format_result(obj) for obj in results]
+        if len(prefix_matches) < self.limit:
+            substring_matches = self.search_queryset(
+                query, self.get_search_query(query), self.limit - len(prefix_matches),
+                exclude=[obj.pk for obj in prefix_matches],
+            )
+            yield [self.format_result(obj) for obj in substring_matches]
 
 
 class SimpleAutocompleteView(AutocompleteView):
     """
     Simple autocomplete view that returns static choices.
     Useful for non-model based autocomplete.
+    
+    Matches are ranked exact, prefix, word-prefix, then substring.
+    Set fuzzy = True to top up substring matches with typo-tolerant matches
+    ("recieve" finds "receive"). The fuzzy index is built once per process
+    and reused for as long as get_choices() returns the same list object.
+    Large indexes take seconds to build; call prepare() at startup so no
+    request waits for that.
+    
+    For dict choices set search_keys to the keys to match on, and value_key
+    and label_key to answer with {'value', 'label'} pairs instead of the
+    dicts. They are stored as pre-normalized columns (see columns.py), built
+    once per process like the fuzzy index.
+    
+    Set choice_index_path to search a memory-mapped index file shared by all
+    worker processes instead of the in-memory list. The file is built from
+    get_choices() on first use, or ahead of time with the build_choice_index
+    management command (see choice_index.py).
     """
     choices: List[Any] = []
+    limit: int = 20
+    fuzzy: bool = False
+    fuzzy_max_distance: int = 2
+    fuzzy_time_budget: Optional[float] = 0.05  # seconds per query
+    choice_index_path: Optional[str] = None
+    search_keys: List[str] = []
+    value_key: Optional[str] = None
+    label_key: Optional[str] = None
+    
+    _fuzzy_cache: Optional[Tuple[List[Any], Tuple[Any, ...], FuzzyIndex]] = None
+    _columns_cache: Optional[Tuple[List[Any], Tuple[Any, ...], ChoiceColumns]] = None
     
     def get_choices(self) -> List[Any]:
         """Get the list of choices. Override to make dynamic."""
         return self.choices
     
+    def get_db_alias(self) -> Optional[str]:
+        # Choices live in memory or in the index file: with no database to
+        # guard, a time budget shouldn't open a connection. Override if
+        # get_choices() queries one.
+        return None
+    
+    def get_columns(self, choices: List[Any]) -> ChoiceColumns:
+        """Get the columnar form of dict choices, building it on first use."""
+        # Cached per class and settings, like get_fuzzy_index()
+        settings = (tuple(self.search_keys), self.value_key, self.label_key)
+        cache = type(self).__dict__.get('_columns_cache')
+        if cache is None or cache[0] is not choices or cache[1] != settings:
+            columns = ChoiceColumns(choices, self.search_keys, self.value_key, self.label_key)
+            cache = (choices, settings, columns)
+            type(self)._columns_cache = cache
+        return cache[2]
+    
+    def get_rows(self, choices: List[Any]) -> Sequence[Any]:
+        """The choices as they appear in responses."""
+        return self.get_columns(choices).rows if self.search_keys else choices
+    
+    def rebuild_choice_index(self) -> int:
+        """Write the choice index file from get_choices(). Returns the entry count."""
+        choices = self.get_choices()
+        if self.search_keys:
+            columns = self.get_columns(choices)
+            return build_choice_index(self.choice_index_path, columns.rows, keys=columns.texts())
+        return build_choice_index(self.choice_index_path, choices)
+    
+    def get_choice_index(self) -> ChoiceIndex:
+        """Open the shared choice index, building it on first use."""
+        try:
+            return open_choice_index(self.choice_index_path)
+        except FileNotFoundError:
+            self.rebuild_choice_index()
+            return open_choice_index(self.choice_index_path)
+    
+    def prepare(self) -> None:
+        """
+        Build the indexes for get_choices() now instead of in the first
+        request, e.g. from AppConfig.ready(). Under a server that loads the
+        app before forking (gunicorn --preload) workers share the result.
+        """
+        choices = self.get_choices()
+        if self.choice_index_path:
+            self.get_choice_index()
+        elif self.search_keys:
+            self.get_columns(choices)
+        if self.fuzzy:
+            self.get_fuzzy_index(choices)
+    
+    def get_fuzzy_index(self, choices: List[Any]) -> FuzzyIndex:
+        """Get the fuzzy index for choices, building it on first use."""
+        # Cached per class, so a subclass with other settings never picks up
+        # its parent's index through attribute inheritance
+        settings = (self.fuzzy_max_distance, tuple(self.search_keys))
+        cache = type(self).__dict__.get('_fuzzy_cache')
+        if cache is None or cache[0] is not choices or cache[1] != settings:
+            if self.search_keys:
+                texts = self.get_columns(choices).texts()
+            else:
+                texts = (str(choice) for choice in choices)
+            index = FuzzyIndex(texts, max_distance=self.fuzzy_max_distance)
+            cache = (choices, settings, index)
+            type(self)._fuzzy_cache = cache
+        return cache[2]
+    
     def get_results(self, query: str) -> List[Any]:
         """Filter choices based on query."""
-        choices = self.get_choices()
+        results = self.get_matches(query)
+        if self.fuzzy and len(results) < self.limit:
+            results += self.get_fuzzy_matches(query, results)
+        return results
+    
+    def get_matches(self, query: str) -> List[Any]:
+        """The best `limit` choices containing the query."""
+        if self.choice_index_path:
+            return self.get_choice_index().search(query, self.limit)
+        if self.search_keys:
+            return self.get_columns(self.get_choices()).search(query, self.limit)
         query_lower = query.lower()
-        
-        return [
-            choice for choice in choices 
-            if query_lower in str(choice).lower()
-        ][:20]  # Limit to 20 results
\ No newline at end of file
+        # Best matches first, selected with a bounded heap
+        return top_k(self.get_choices(),
+                     lambda choice: match_score(str(choice).lower(), query_lower),
+                     self.limit)
+    
+    def get_fuzzy_matches(self, query: str, exclude: List[Any]) -> List[Any]:
+        """Typo-tolerant matches not in exclude, up to `limit` in total."""
+        choices = self.get_choices()
+        index = self.get_fuzzy_index(choices)
+        rows = self.get_rows(choices)
+        matches: List[Any] = []
+        for position in index.search(query, self.limit, self.fuzzy_time_budget):
+            choice = rows[position]
+            if choice not in exclude and choice not in matches:
+                matches.append(choice)
+            if len(exclude) + len(matches) >= self.limit:
+                break
+        return matches
+    
+    def get_result_tiers(self, query: str) -> Iterator[List[Any]]:
+        """Substring matches, then fuzzy matches when fuzzy is set and there's room."""
+        if type(self).get_results is not SimpleAutocompleteView.get_results:
+            # A customized get_results() is served as a single chunk
+            yield self.get_results(query)
+            return
+        results = self.get_matches(query)
+        yield results
+        if self.fuzzy and len(results) < self.limit:
+            yield self.get_fuzzy_matches(query, results)
@@ -1,3 +1,4 @@
+import json
 from typing import Dict, Any, Optional, List
 from django import forms
 from django.urls import reverse_lazy
@@ -12,8 +13,14 @@ class AutocompleteWidget(forms.TextInput):
                  min_length: int = 2, debounce_delay: int = 300,
                  value_field: str = 'value', label_field: str = 'label', 
                  initial_display_value: Optional[str] = None,
-                 host_attrs: Optional[Dict[str, Any]] = None) -> None:
+                 host_attrs: Optional[Dict[str, Any]] = None,
+                 source: Optional[str] = None, request_timeout: int = 10000,
+                 lazy: Optional[str] = None, limit: int = 20) -> None:
         self.url = url
+        self.lazy = lazy
+        self.limit = limit
+        self.request_timeout = request_timeout
+        self.source = source
         self.min_length = min_length
         self.debounce_delay = debounce_delay
         self.value_field = value_field
@@ -26,26 +33,25 @@ class AutocompleteWidget(forms.TextInput):
         context = super().get_context(name, value, attrs)
         context["widget"].update(
             {
-                "url": self.url or reverse_lazy("autocomplete"),
+                # A local source needs no endpoint, nor a project URL named "autocomplete"
+                "url": self.url or (None if self.source else reverse_lazy("autocomplete")),
                 "min_length": self.min_length,
                 "debounce_delay": self.debounce_delay,
                 "value_field": self.value_field,
                 "label_field": self.label_field,
                 "initial_display_value": self.initial_display_value,
                 "host_attrs": self.host_attrs,
+                "source": self.source,
+                "request_timeout": self.request_timeout,
+                "lazy": self.lazy,
+                "limit": self.limit,
+                "multiple": False,
             }
         )
         return context
     
-    def set_initial_display_value_from_instance(self, obj: Any, search_fields: Optional[List[str]] = None) -> None:
-        """
-        Helper method to set initial_display_value from a model instance.
-        This can be called by ModelAutocompleteField.
-        """
-        if not obj:
-            return
-            
-        # Use search_fields if provided to determine display value
+    def get_display_value_for_instance(self, obj: Any, search_fields: Optional[List[str]] = None) -> str:
+        """Display value for a model instance: its first search field, or str(obj)."""
         if search_fields:
             first_field = search_fields[0]
             # Handle related fields (e.g., 'user__username')
@@ -56,12 +62,19 @@ class AutocompleteWidget(forms.TextInput):
                     value = getattr(value, part, None)
                     if value is None:
                         break
-                self.initial_display_value = str(value) if value is not None else str(obj)
-            else:
-                self.initial_display_value = str(getattr(obj, first_field, obj))
-        else:
-            # Fall back to string representation
-            self.initial_display_value = str(obj)
+                return str(value) if value is not None else str(obj)
+            return str(getattr(obj, first_field, obj))
+        # Fall back to string representation
+        return str(obj)
+    
+    def set_initial_display_value_from_instance(self, obj: Any, search_fields: Optional[List[str]] = None) -> None:
+        """
+        Helper method to set initial_display_value from a model instance.
+        This can be called by ModelAutocompleteField.
+        """
+        if not obj:
+            return
+        self.initial_display_value = self.get_display_value_for_instance(obj, search_fields)
 
     # When migrating to 5.2 only, use this to module load instead of in template. Nice.
     # class Media:
@@ -73,3 +86,46 @@ class AutocompleteWidget(forms.TextInput):
     #             },
     #         ),
     #     ]
+
+
+class MultipleAutocompleteWidget(AutocompleteWidget):
+    """
+    Autocomplete widget that selects several values, shown as chips.
+    Submits one form value per selection, like a <select multiple>.
+    """
+
+    allow_multiple_selected = True
+
+    def __init__(self, *args: Any, initial_items: Optional[List[Dict[str, str]]] = None,
+                 **kwargs: Any) -> None:
+        self.initial_items = initial_items or []
+        super().__init__(*args, **kwargs)
+
+    def format_value(self, value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, (str, int)) or not hasattr(value, '__iter__'):
+            value = [value]
+        return [str(v) for v in value if v not in (None, '')]
+
+    def value_from_datadict(self, data: Any, files: Any, name: str) -> Any:
+        getter = getattr(data, 'getlist', None)
+        return getter(name) if getter else data.get(name)
+
+    def value_omitted_from_data(self, data: Any, files: Any, name: str) -> bool:
+        # An element with nothing selected submits nothing at all
+        return False
+
+    def get_context(self, name: str, value: Any, attrs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        context = super().get_context(name, value, attrs)
+        values = context["widget"]["value"]
+        labels = {item["value"]: item["label"] for item in self.initial_items}
+        context["widget"].update(
+            {
+                "multiple": True,
+                "initial_items_json": json.dumps(
+                    [{"value": v, "label": labels.get(v, v)} for v in values]
+                ),
+            }
+        )
+        return context
@@ -0,0 +1,99 @@
+"""
+Tests for the memory-mapped choice index.
+"""
+
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from suitable_django_autocomplete.choice_index import ChoiceIndex, build_choice_index
+from suitable_django_autocomplete.views import SimpleAutocompleteView
+
+CITIES = ['Aarhus', 'Copenhagen', 'New Copenhagen', 'Malmö Centrum', 'Odense', 'Öresund', 'Coppe']
+
+
+
+def temporary_directory(test_class):
+    """A directory removed when test_class's tests are done."""
+    directory = tempfile.TemporaryDirectory()
+    test_class.addClassCleanup(directory.cleanup)
+    return directory.name
+
+
+class CityView(SimpleAutocompleteView):
+    choices = CITIES
+    choice_index_path = None  # set by ChoiceIndexViewTest
+
+
+class ChoiceIndexTest(SimpleTestCase):
+    """Test building and searching an index file."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = temporary_directory(cls)
+
+    def setUp(self):
+        self.path = os.path.join(self.directory, f'{self._testMethodName}.idx')
+        self.assertEqual(build_choice_index(self.path, CITIES), len(CITIES))
+        self.index = ChoiceIndex(self.path)
+        self.addCleanup(self.index.close)
+
+    def test_prefix_then_word_prefix_then_substring(self):
+        self.assertEqual(self.index.search('cop'), ['Copenhagen', 'Coppe', 'New Copenhagen'])
+        self.assertEqual(self.index.search('hagen'), ['Copenhagen', 'New Copenhagen'])
+
+    def test_normalized_matching(self):
+        self.assertEqual(self.index.search('oresund'), ['Öresund'])
+        self.assertEqual(self.index.search('MALMO c'), ['Malmö Centrum'])
+
+    def test_limit_and_misses(self):
+        self.assertEqual(len(self.index.search('e', limit=2)), 2)
+        self.assertEqual(self.index.search('zz'), [])
+
+    def test_structured_choices(self):
+        path = os.path.join(self.directory, 'countries.idx')
+        build_choice_index(path, [{'code': 'DK', 'name': 'Denmark'}])
+        index = ChoiceIndex(path)
+        self.addCleanup(index.close)
+        self.assertEqual(index.search('denmark'), [{'code': 'DK', 'name': 'Denmark'}])
+
+    def test_rejects_oversized_blobs(self):
+        # Keys and payloads each need to fit 32 bit offsets
+        path = os.path.join(self.directory, 'oversized.idx')
+        with mock.patch('suitable_django_autocomplete.choice_index.MAX_OFFSET', 20):
+            with self.assertRaisesMessage(ValueError, "too large"):
+                build_choice_index(path, ['a'], keys=['k' * 30])
+            with self.assertRaisesMessage(ValueError, "too large"):
+                build_choice_index(path, ['p' * 30], keys=['k'])
+        self.assertFalse(os.path.exists(path))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as handle:
+            handle.write(b'not an index' * 4)
+        with self.assertRaises(ValueError):
+            ChoiceIndex(self.path)
+
+
+class ChoiceIndexViewTest(SimpleTestCase):
+    """Test SimpleAutocompleteView with a choice index."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        CityView.choice_index_path = os.path.join(temporary_directory(cls), 'cities.idx')
+        cls.addClassCleanup(setattr, CityView, 'choice_index_path', None)
+
+    def test_index_is_built_on_first_use(self):
+        self.assertEqual(CityView().get_results('odense'), ['Odense'])
+        self.assertTrue(os.path.exists(CityView.choice_index_path))
+        self.assertIs(CityView().get_choice_index(), CityView().get_choice_index())
+
+    def test_build_command(self):
+        out = StringIO()
+        # The module as the test runner imported it, so the path set above applies
+        call_command('build_choice_index', f'{CityView.__module__}.CityView', stdout=out)
+        self.assertIn(f"Indexed {len(CITIES)} choices", out.getvalue())
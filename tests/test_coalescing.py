@@ -0,0 +1,139 @@
+"""
+Tests for single-flight coalescing of identical concurrent queries.
+"""
+
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from suitable_django_autocomplete.coalescing import SingleFlight, acquire_cache_lock, release_cache_lock
+from suitable_django_autocomplete.views import SimpleAutocompleteView
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(position):
+        barrier.wait()
+        results[position] = target()
+
+    threads = [threading.Thread(target=run, args=(position,)) for position in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTest(SimpleTestCase):
+    """Test that concurrent calls for one key share a computation."""
+
+    def test_threads_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(1)
+            return ['shared']
+
+        def call():
+            return flight.do('key', compute)
+
+        # Let the followers pile up behind the leader before it finishes
+        threading.Timer(0.2, release.set).start()
+        self.assertEqual(run_concurrently(8, call), [['shared']] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        threading.Timer(0.2, release.set).start()
+
+        def compute():
+            release.wait(1)
+            raise ValueError('boom')
+
+        def call():
+            try:
+                flight.do('key', compute)
+            except ValueError as error:
+                return str(error)
+
+        self.assertEqual(run_concurrently(4, call), ['boom'] * 4)
+        # A failed call isn't remembered
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+
+class CountingView(SimpleAutocompleteView):
+    choices = ['Apple', 'Apricot', 'Banana']
+    cache_timeout = 60
+    calls = []
+    delay = 0.0
+
+    def get_results(self, query):
+        type(self).calls.append(query)
+        threading.Event().wait(self.delay)
+        return super().get_results(query)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CoalescedViewTest(SimpleTestCase):
+    """Test coalescing and stale-while-revalidate in AutocompleteView."""
+
+    def setUp(self):
+        cache.clear()
+        CountingView.calls = []
+
+    def test_concurrent_requests_run_one_query(self):
+        class View(CountingView):
+            coalesce = True
+            delay = 0.2
+
+        results = run_concurrently(6, lambda: View().get_results_within_budget('ap'))
+
+        self.assertEqual(results, [(['Apple', 'Apricot'], False)] * 6)
+        self.assertEqual(CountingView.calls, ['ap'])
+
+    def test_waits_for_another_process(self):
+        class View(CountingView):
+            coalesce = True
+            coalesce_lock_timeout = 2
+
+        view = View()
+        lock_key = f"{view.get_cache_key('ap')}:lock"
+        token = acquire_cache_lock(cache, lock_key, 2)
+
+        def other_process_finishes():
+            view.set_cached_results('ap', ['from elsewhere'])
+            release_cache_lock(cache, lock_key, token)
+
+        threading.Timer(0.1, other_process_finishes).start()
+        self.assertEqual(view.get_results_within_budget('ap'), (['from elsewhere'], False))
+        self.assertEqual(CountingView.calls, [])
+
+    def test_stale_results_are_served_while_refreshing(self):
+        class View(CountingView):
+            cache_stale_timeout = 60
+
+        view = View()
+        view.set_cached_results('ap', ['old'])
+        self.assertEqual(view.get_cached_entry('ap'), (['old'], True))
+
+        cache.delete(f"{view.get_cache_key('ap')}:fresh")
+        self.assertEqual(view.get_cached_entry('ap'), (['old'], False))
+
+        # Someone else is refreshing: serve the stale results
+        lock_key = f"{view.get_cache_key('ap')}:lock"
+        token = acquire_cache_lock(cache, lock_key, 5)
+        self.assertEqual(view.get_results_within_budget('ap'), (['old'], False))
+        self.assertEqual(CountingView.calls, [])
+
+        # Nobody is: refresh
+        release_cache_lock(cache, lock_key, token)
+        self.assertEqual(view.get_results_within_budget('ap'), (['Apple', 'Apricot'], False))
+        self.assertEqual(view.get_cached_entry('ap'), (['Apple', 'Apricot'], True))
+        self.assertEqual(CountingView.calls, ['ap'])
@@ -0,0 +1,90 @@
+"""
+Tests for structured (dict) choices in SimpleAutocompleteView.
+"""
+
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+from suitable_django_autocomplete.columns import ChoiceColumns
+from suitable_django_autocomplete.views import SimpleAutocompleteView
+
+COUNTRIES = [
+    {'code': 'US', 'name': 'United States'},
+    {'code': 'GB', 'name': 'United Kingdom'},
+    {'code': 'DK', 'name': 'Denmark'},
+    {'code': 'IS', 'name': 'Ísland'},
+    {'code': 'UA', 'name': 'Ukraine'},
+]
+
+
+class CountryView(SimpleAutocompleteView):
+    choices = COUNTRIES
+    search_keys = ['code', 'name']
+    value_key = 'code'
+    label_key = 'name'
+
+
+class ChoiceColumnsTest(SimpleTestCase):
+    """Test the columnar choice storage."""
+
+    def setUp(self):
+        self.columns = ChoiceColumns(COUNTRIES, ['code', 'name'])
+
+    def test_matches_any_search_key(self):
+        self.assertEqual(self.columns.search('dk'), [COUNTRIES[2]])
+        self.assertEqual(self.columns.search('denm'), [COUNTRIES[2]])
+
+    def test_ranking_across_keys(self):
+        def codes(query):
+            return [c['code'] for c in self.columns.search(query)]
+
+        # Code/name prefixes first, then substrings in choice order
+        self.assertEqual(codes('d'), ['DK', 'US', 'GB', 'IS'])
+        self.assertEqual(codes('states'), ['US'])
+        self.assertEqual(codes('is'), ['IS'])
+        self.assertEqual(self.columns.search('d', limit=1), [COUNTRIES[2]])
+
+    def test_normalized_values(self):
+        self.assertEqual(self.columns.search('island'), [COUNTRIES[3]])
+
+    def test_texts(self):
+        self.assertEqual(list(self.columns.texts())[0], 'us united states')
+
+
+class StructuredChoicesViewTest(SimpleTestCase):
+    """Test SimpleAutocompleteView with search_keys."""
+
+    def test_value_label_rows(self):
+        self.assertEqual(CountryView().get_results('denmark'), [{'value': 'DK', 'label': 'Denmark'}])
+
+    def test_columns_are_built_once(self):
+        self.assertIs(CountryView().get_columns(COUNTRIES), CountryView().get_columns(COUNTRIES))
+
+    def test_original_dicts_without_value_and_label_keys(self):
+        class PlainCountryView(SimpleAutocompleteView):
+            choices = COUNTRIES
+            search_keys = ['name']
+
+        self.assertEqual(PlainCountryView().get_results('ukr'), [COUNTRIES[4]])
+
+    def test_subclass_with_other_keys(self):
+        class NameView(CountryView):
+            search_keys = ['name']
+            value_key = None
+            label_key = None
+
+        # Warm the parent's columns first; the subclass must not reuse them
+        self.assertEqual(CountryView().get_results('dk'), [{'value': 'DK', 'label': 'Denmark'}])
+        self.assertEqual(NameView().get_results('dk'), [])
+        self.assertEqual(NameView().get_results('denm'), [COUNTRIES[2]])
+        self.assertEqual(CountryView().get_results('denm'), [{'value': 'DK', 'label': 'Denmark'}])
+
+    def test_fuzzy_and_choice_index(self):
+        class IndexedCountryView(CountryView):
+            fuzzy = True
+            choice_index_path = os.path.join(tempfile.mkdtemp(), 'countries.idx')
+
+        view = IndexedCountryView()
+        self.assertEqual(view.get_results('kingd'), [{'value': 'GB', 'label': 'United Kingdom'}])
+        self.assertEqual(view.get_results('Denmrk'), [{'value': 'DK', 'label': 'Denmark'}])
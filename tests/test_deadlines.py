@@ -0,0 +1,175 @@
+"""
+Tests for per-view time budgets and degraded responses.
+"""
+
+import json
+import time
+from contextlib import nullcontext
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from suitable_django_autocomplete.deadlines import QueryDeadlineExceeded, query_deadline
+from suitable_django_autocomplete.views import ModelAutocompleteView, SimpleAutocompleteView
+
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+def run_slow_query():
+    with connection.cursor() as cursor:
+        cursor.execute(SLOW_QUERY)
+
+
+class SlowUserView(ModelAutocompleteView):
+    model = User
+    search_fields = ['username']
+    time_budget = 0.05
+
+    def get_results(self, query):
+        run_slow_query()
+        return super().get_results(query)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryDeadlineTest(TestCase):
+    """Test that budgets are enforced and degrade gracefully."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        User.objects.create_user('annabel')
+        User.objects.create_user('joanna')
+        cache.clear()
+
+    def get(self, view_class, query):
+        response = view_class.as_view()(self.factory.get('/', {'q': query}))
+        return json.loads(response.content)
+
+    def test_slow_query_is_interrupted(self):
+        with self.assertRaises(QueryDeadlineExceeded):
+            with query_deadline(0.05):
+                run_slow_query()
+        # The connection is still usable afterwards
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_no_budget_is_a_no_op(self):
+        with query_deadline(None):
+            self.assertEqual(User.objects.count(), 2)
+
+    def test_falls_back_to_prefix_results(self):
+        data = self.get(SlowUserView, 'ann')
+        self.assertTrue(data['partial'])
+        self.assertEqual([r['label'] for r in data['results']], ['annabel'])
+
+    def test_falls_back_to_cached_prefix(self):
+        class CachedSlowView(SlowUserView):
+            cache_timeout = 60
+
+        CachedSlowView().set_cached_results('an', [
+            {'value': '1', 'label': 'cached annabel'},
+            {'value': '2', 'label': 'cached dana'},
+        ])
+
+        data = self.get(CachedSlowView, 'anna')
+        self.assertTrue(data['partial'])
+        self.assertEqual([r['label'] for r in data['results']], ['cached annabel'])
+
+        # Cached results for the exact query are served without querying
+        self.assertEqual(self.get(CachedSlowView, 'an')['results'][1]['label'], 'cached dana')
+
+    def test_fast_queries_are_complete(self):
+        class FastView(SlowUserView):
+            def get_results(self, query):
+                return ModelAutocompleteView.get_results(self, query)
+
+        data = self.get(FastView, 'ann')
+        self.assertNotIn('partial', data)
+        self.assertEqual(len(data['results']), 2)
+
+    def test_fallback_shares_the_budget(self):
+        class SlowFallbackView(SlowUserView):
+            time_budget = 0.2
+
+            def get_fallback_results(self, query):
+                run_slow_query()
+                return super().get_fallback_results(query)
+
+        started = time.monotonic()
+        data = self.get(SlowFallbackView, 'ann')
+        elapsed = time.monotonic() - started
+        self.assertTrue(data['partial'])
+        self.assertEqual(data['results'], [])
+        # Main query and fallback together stay within the budget, not twice it
+        self.assertLess(elapsed, 0.3)
+
+    def test_cached_prefix_of_dicts_without_labels(self):
+        class CountryView(SimpleAutocompleteView):
+            choices = [{'code': 'DK', 'name': 'Denmark'}, {'code': 'SE', 'name': 'Sweden'}]
+            search_keys = ['code', 'name']
+            cache_timeout = 60
+
+        view = CountryView()
+        view.set_cached_results('d', view.get_results('d'))
+        self.assertEqual(view.get_degraded_results('denm'), [{'code': 'DK', 'name': 'Denmark'}])
+
+
+class FakeCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+
+    def fetchone(self):
+        return ['0']
+
+
+class FakePostgreSQLConnection:
+    vendor = 'postgresql'
+    alias = 'default'
+
+    def __init__(self, in_atomic_block):
+        self.in_atomic_block = in_atomic_block
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursor(self.statements)
+
+
+@mock.patch('suitable_django_autocomplete.deadlines.transaction.atomic', lambda using: nullcontext())
+class DeadlineStatementsTest(SimpleTestCase):
+    """Test the statements a budget costs, and that views without a database skip them."""
+
+    def run_budgeted(self, connection):
+        with mock.patch('suitable_django_autocomplete.deadlines.connections', {'default': connection}):
+            with query_deadline(0.5):
+                pass
+        return connection.statements
+
+    def test_postgresql_outside_a_transaction_sets_the_timeout_only(self):
+        statements = self.run_budgeted(FakePostgreSQLConnection(in_atomic_block=False))
+        self.assertEqual(statements, ["SELECT set_config('statement_timeout', %s, true)"])
+
+    def test_postgresql_inside_a_transaction_restores_the_timeout(self):
+        statements = self.run_budgeted(FakePostgreSQLConnection(in_atomic_block=True))
+        self.assertEqual(len(statements), 3)
+        self.assertIn('current_setting', statements[0])
+
+    def test_views_without_a_database_skip_the_deadline(self):
+        class BudgetedView(SimpleAutocompleteView):
+            choices = ['Apple', 'Apricot']
+            time_budget = 0.5
+
+        with mock.patch('suitable_django_autocomplete.deadlines.connections') as connections:
+            self.assertEqual(BudgetedView().get_results_within_budget('ap'), (['Apple', 'Apricot'], False))
+        connections.__getitem__.assert_not_called()
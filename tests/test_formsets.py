@@ -0,0 +1,68 @@
+"""
+Tests for bulk validation of autocomplete values in formsets.
+"""
+
+from django import forms
+from django.contrib.auth.models import User
+from django.test import TestCase
+from suitable_django_autocomplete import ModelAutocompleteField
+from suitable_django_autocomplete.formsets import BaseAutocompleteFormSet
+
+
+class AssignmentForm(forms.Form):
+    user = ModelAutocompleteField(queryset=User.objects.all(), url='/autocomplete/users/')
+    reviewer = ModelAutocompleteField(
+        queryset=User.objects.filter(is_staff=True),
+        url='/autocomplete/staff/',
+        required=False
+    )
+
+
+AssignmentFormSet = forms.formset_factory(AssignmentForm, formset=BaseAutocompleteFormSet, extra=0)
+
+
+class BulkFormsetValidationTest(TestCase):
+    """Test that a formset resolves autocomplete values with one query per column."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'user{i}') for i in range(30)]
+        self.staff = User.objects.create_user('staff', is_staff=True)
+
+    def formset_data(self, rows):
+        data = {'form-TOTAL_FORMS': str(len(rows)), 'form-INITIAL_FORMS': '0'}
+        for i, (user, reviewer) in enumerate(rows):
+            data[f'form-{i}-user'] = user
+            data[f'form-{i}-reviewer'] = reviewer
+        return data
+
+    def test_one_query_per_column(self):
+        rows = [(str(user.pk), str(self.staff.pk)) for user in self.users]
+        formset = AssignmentFormSet(data=self.formset_data(rows))
+
+        with self.assertNumQueries(2):
+            self.assertTrue(formset.is_valid())
+
+        self.assertEqual([form.cleaned_data['user'] for form in formset], self.users)
+        self.assertEqual(formset[0].cleaned_data['reviewer'], self.staff)
+
+    def test_error_semantics_are_preserved(self):
+        rows = [
+            (str(self.users[0].pk), ''),
+            ('999999', ''),
+            ('not-a-pk', ''),
+            (str(self.users[1].pk), str(self.users[2].pk)),  # not staff
+        ]
+        formset = AssignmentFormSet(data=self.formset_data(rows))
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.errors[0], {})
+        self.assertEqual(formset[1].errors['user'].as_data()[0].code, 'invalid_choice')
+        self.assertEqual(formset[2].errors['user'].as_data()[0].code, 'invalid_choice')
+        self.assertEqual(formset[3].errors['reviewer'].as_data()[0].code, 'invalid_choice')
+        self.assertIsNone(formset[0].cleaned_data['reviewer'])
+
+    def test_string_representation_fallback_still_works(self):
+        formset = AssignmentFormSet(data=self.formset_data([('user5', '')]))
+
+        self.assertTrue(formset.is_valid())
+        self.assertEqual(formset[0].cleaned_data['user'], self.users[5])
@@ -0,0 +1,96 @@
+"""
+Tests for typo-tolerant matching in SimpleAutocompleteView.
+"""
+
+from django.test import SimpleTestCase
+from suitable_django_autocomplete.fuzzy import FuzzyIndex, edit_distance
+from suitable_django_autocomplete.views import SimpleAutocompleteView
+
+
+class FruitView(SimpleAutocompleteView):
+    choices = ['Apple', 'Grape', 'Grapefruit', 'Receive mail', 'Crème brûlée', 'Strawberry']
+    fuzzy = True
+
+
+class FuzzyIndexTest(SimpleTestCase):
+    """Test the deletion dictionary directly."""
+
+    def setUp(self):
+        self.labels = FruitView.choices
+        self.index = FuzzyIndex(self.labels)
+
+    def search(self, query):
+        return [self.labels[i] for i in self.index.search(query)]
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance('recieve', 'receive', 2), 1)  # transposition
+        self.assertEqual(edit_distance('grpe', 'grape', 2), 1)
+        self.assertEqual(edit_distance('abc', 'xyz123', 2), 3)  # bounded
+
+    def test_typos_are_found(self):
+        self.assertEqual(self.search('recieve'), ['Receive mail'])
+        self.assertEqual(self.search('Grpe'), ['Grape', 'Grapefruit'])
+        self.assertEqual(self.search('stawbery'), ['Strawberry'])
+
+    def test_partial_words_and_accents(self):
+        self.assertEqual(self.search('recie'), ['Receive mail'])
+        self.assertEqual(self.search('creme')[0], 'Crème brûlée')
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search('recieve mial'), ['Receive mail'])
+        self.assertEqual(self.search('recieve grape'), [])
+
+    def test_short_and_unknown_queries(self):
+        self.assertEqual(self.search('ap'), [])
+        self.assertEqual(self.search('xyzzy'), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search('grape', limit=1)), 1)
+
+    def test_build_size_is_bounded(self):
+        # Distinct words of 7+ letters, the worst case: nothing is shared.
+        # Prefixes of 3-6 letters get 4+5+6+7 single deletions and the
+        # 7 letter prefix 29 single and double ones
+        words = [''.join(chr(ord('a') + (n // 26 ** i) % 26) for i in range(8)) for n in range(0, 400000, 97)]
+        labels = [' '.join(pair) for pair in zip(words[::2], words[1::2])]
+        index = FuzzyIndex(labels)
+        self.assertLessEqual(index.entry_count(), 51 * len(words))
+        self.assertEqual(index.search(words[0][:6] + 'x'), [0])
+
+
+class FuzzySimpleAutocompleteViewTest(SimpleTestCase):
+    """Test fuzzy matching through the view."""
+
+    def test_substring_matches_come_first(self):
+        results = FruitView().get_results('grape')
+        self.assertEqual(results[:2], ['Grape', 'Grapefruit'])
+
+    def test_fuzzy_tops_up_results(self):
+        self.assertEqual(FruitView().get_results('Grpe'), ['Grape', 'Grapefruit'])
+
+    def test_fuzzy_is_opt_in(self):
+        class PlainView(SimpleAutocompleteView):
+            choices = FruitView.choices
+
+        self.assertEqual(PlainView().get_results('Grpe'), [])
+
+    def test_prepare_builds_the_index_ahead(self):
+        class PreparedView(FruitView):
+            pass
+
+        PreparedView().prepare()
+        index = PreparedView.__dict__['_fuzzy_cache'][2]
+        self.assertIs(PreparedView().get_fuzzy_index(PreparedView().get_choices()), index)
+
+    def test_index_is_reused(self):
+        view = FruitView()
+        index = view.get_fuzzy_index(view.get_choices())
+        self.assertIs(FruitView().get_fuzzy_index(FruitView().get_choices()), index)
+
+    def test_subclasses_build_their_own_index(self):
+        class ExactView(FruitView):
+            fuzzy_max_distance = 0
+
+        FruitView().get_results('Grpe')
+        self.assertEqual(ExactView().get_results('Grpe'), [])
+        self.assertEqual(FruitView().get_results('Grpe'), ['Grape', 'Grapefruit'])
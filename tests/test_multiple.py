@@ -0,0 +1,80 @@
+"""
+Tests for ModelMultipleAutocompleteField.
+"""
+
+import json
+
+from django import forms
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from django.test import TestCase
+from suitable_django_autocomplete import ModelMultipleAutocompleteField
+
+
+class ReviewForm(forms.Form):
+    reviewers = ModelMultipleAutocompleteField(
+        queryset=User.objects.all(),
+        url='/autocomplete/users/',
+        search_fields=['username'],
+        required=False
+    )
+
+
+class ModelMultipleAutocompleteFieldTest(TestCase):
+    """Test multi-value validation and rendering."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'reviewer{i}') for i in range(10)]
+
+    def test_all_values_are_validated_in_one_query(self):
+        data = QueryDict(mutable=True)
+        data.setlist('reviewers', [str(user.pk) for user in self.users])
+        form = ReviewForm(data=data)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(set(form.cleaned_data['reviewers']), set(self.users))
+
+    def test_unknown_value_is_rejected(self):
+        data = QueryDict(mutable=True)
+        data.setlist('reviewers', [str(self.users[0].pk), '999999'])
+        form = ReviewForm(data=data)
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['reviewers'][0].count('999999'), 1)
+
+    def test_nothing_selected(self):
+        form = ReviewForm(data={})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(list(form.cleaned_data['reviewers']), [])
+
+    def test_initial_labels_use_one_query(self):
+        form = ReviewForm(initial={'reviewers': [user.pk for user in self.users[:3]]})
+
+        with self.assertNumQueries(1):
+            html = str(form['reviewers'])
+
+        self.assertIn(' multiple ', html)
+        items = json.loads(html.split('data-initial-items="')[1].split('"')[0].replace('&quot;', '"'))
+        self.assertEqual(items, [
+            {'value': str(user.pk), 'label': user.username} for user in self.users[:3]
+        ])
+
+    def test_initial_instances_need_no_query(self):
+        form = ReviewForm(initial={'reviewers': self.users[:2]})
+
+        with self.assertNumQueries(0):
+            html = str(form['reviewers'])
+
+        self.assertIn('reviewer1', html)
+
+    def test_labels_follow_the_rendered_values(self):
+        alice, carol = self.users[0], self.users[2]
+        form = ReviewForm(data={'reviewers': [str(carol.pk)]}, initial={'reviewers': [alice]})
+
+        # has_changed() prepares the initial values before rendering
+        self.assertEqual(form.changed_data, ['reviewers'])
+        html = str(form['reviewers'])
+
+        items = json.loads(html.split('data-initial-items="')[1].split('"')[0].replace('&quot;', '"'))
+        self.assertEqual(items, [{'value': str(carol.pk), 'label': carol.username}])
@@ -0,0 +1,69 @@
+"""
+Tests for relevance ranking of autocomplete results.
+"""
+
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth.models import User
+from suitable_django_autocomplete.ranking import match_score, top_k, EXACT, PREFIX, WORD_PREFIX, SUBSTRING
+from suitable_django_autocomplete.views import ModelAutocompleteView, SimpleAutocompleteView
+
+
+class UserView(ModelAutocompleteView):
+    model = User
+    search_fields = ['username', 'email']
+
+
+class MatchScoreTest(SimpleTestCase):
+    """Test the in-memory scoring tiers."""
+
+    def test_tiers(self):
+        self.assertEqual(match_score('ann', 'ann'), EXACT)
+        self.assertEqual(match_score('anna', 'ann'), PREFIX)
+        self.assertEqual(match_score('mary ann', 'ann'), WORD_PREFIX)
+        self.assertEqual(match_score('joanne', 'ann'), SUBSTRING)
+        self.assertEqual(match_score('bob', 'ann'), 0)
+
+    def test_top_k_keeps_order_for_ties(self):
+        items = ['joanne', 'ann', 'hannah', 'anna', 'bob']
+        self.assertEqual(top_k(items, lambda item: match_score(item, 'ann'), 3),
+                         ['ann', 'anna', 'joanne'])
+
+    def test_simple_view_ranks_exact_first(self):
+        class NameView(SimpleAutocompleteView):
+            choices = ['Joanne'] * 25 + ['Mary Ann', 'Ann']
+
+        results = NameView().get_results('ann')
+        self.assertEqual(results[:2], ['Ann', 'Mary Ann'])
+        self.assertEqual(len(results), 20)
+
+
+class ModelRankingTest(TestCase):
+    """Test ranking pushed down to the database."""
+
+    def setUp(self):
+        for i in range(25):
+            User.objects.create_user(f'joanne{i}', f'joanne{i}@example.com')
+        User.objects.create_user('mary ann', 'mary@example.com')
+        User.objects.create_user('ann', 'someone@example.com')
+        User.objects.create_user('bob', 'ann@example.com')
+
+    def labels(self, view, query):
+        return [result['label'] for result in view.get_results(query)]
+
+    def test_exact_match_is_not_truncated(self):
+        labels = self.labels(UserView(), 'ann')
+        self.assertEqual(labels[:3], ['ann', 'bob', 'mary ann'])
+        self.assertEqual(len(labels), 20)
+
+    def test_field_weights(self):
+        class EmailFirstView(UserView):
+            search_weights = {'email': 2}
+
+        # bob's email prefix (3 x 2) outranks ann's exact username (4 x 1)
+        self.assertEqual(self.labels(EmailFirstView(), 'ann')[:2], ['bob', 'ann'])
+
+    def test_ranking_can_be_disabled(self):
+        class UnrankedView(UserView):
+            ranked = False
+
+        self.assertEqual(len(self.labels(UnrankedView(), 'ann')), 20)
@@ -0,0 +1,106 @@
+"""
+Tests for query recording and cache warming.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from suitable_django_autocomplete.recording import QueryRecorder, recorder
+from suitable_django_autocomplete.views import SimpleAutocompleteView
+
+
+class RecordedFruitView(SimpleAutocompleteView):
+    choices = ['Apple', 'Apricot', 'Banana']
+    cache_timeout = 60
+    record_sample_rate = 1.0
+
+
+class UserFruitView(RecordedFruitView):
+    def get_choices(self):
+        return [f'{self.request.user} fruit']
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryRecorderTest(SimpleTestCase):
+    """Test the bounded, batched query counters."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_are_flushed_in_batches(self):
+        rec = QueryRecorder(flush_every=3)
+        rec.record('view', 'Ap')
+        rec.record('view', ' ap ')
+        self.assertEqual(rec.top_queries('view', 10), [])
+
+        rec.record('view', 'ban')
+        self.assertEqual(rec.top_queries('view', 10), ['ap', 'ban'])
+
+    def test_counts_merge_across_flushes(self):
+        rec = QueryRecorder(flush_every=1000)
+        rec.record('view', 'ban')
+        rec.flush()
+        rec.record('view', 'ap')
+        rec.record('view', 'ap')
+        rec.flush()
+        self.assertEqual(rec.top_queries('view', 1), ['ap'])
+
+    def test_idle_recorders_stay_off_the_cache(self):
+        rec = QueryRecorder(flush_every=1000)
+        with mock.patch('suitable_django_autocomplete.recording.atexit.register') as register, \
+                mock.patch('suitable_django_autocomplete.recording.caches') as caches:
+            rec.flush()
+            caches.__getitem__.assert_not_called()
+            register.assert_not_called()
+
+            # The first recorded query arranges a flush at exit, once
+            rec.record('view', 'ap')
+            rec.record('view', 'ban')
+            register.assert_called_once_with(rec.flush)
+
+    def test_entries_are_bounded(self):
+        rec = QueryRecorder(max_entries=10, flush_every=1000)
+        for _ in range(3):
+            rec.record('view', 'popular')
+        for i in range(50):
+            rec.record('view', f'rare{i}')
+        rec.flush()
+        stored = cache.get(rec.cache_key('view'))
+        self.assertLessEqual(len(stored), 10)
+        self.assertIn('popular', stored)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CacheWarmingTest(SimpleTestCase):
+    """Test recording through the view and replaying with the command."""
+
+    def setUp(self):
+        cache.clear()
+        self.label = RecordedFruitView().get_view_label()
+        self.addCleanup(recorder.clear, self.label)
+
+    def test_view_records_and_command_warms(self):
+        factory = RequestFactory()
+        for query in ['ap', 'ap', 'ban']:
+            RecordedFruitView.as_view()(factory.get('/', {'q': query}))
+        recorder.flush()
+        cache.delete_many([RecordedFruitView().get_cache_key(q) for q in ['ap', 'ban']])
+
+        out = StringIO()
+        call_command('warm_autocomplete_cache', self.label, '--top', '1', stdout=out)
+
+        self.assertIn('Warmed 1 queries', out.getvalue())
+        self.assertEqual(RecordedFruitView().get_cached_results('ap'), ['Apple', 'Apricot'])
+        self.assertIsNone(RecordedFruitView().get_cached_results('ban'))
+
+    def test_views_that_need_a_request_fail_clearly(self):
+        label = UserFruitView().get_view_label()
+        self.addCleanup(recorder.clear, label)
+        recorder.record(label, 'ap')
+        recorder.flush()
+
+        with self.assertRaisesMessage(CommandError, 'reads self.request.user'):
+            call_command('warm_autocomplete_cache', label, stdout=StringIO())
@@ -0,0 +1,119 @@
+"""
+Tests for read replica routing of autocomplete reads.
+"""
+
+from django import forms
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase
+from suitable_django_autocomplete import ModelAutocompleteField, ModelMultipleAutocompleteField
+from suitable_django_autocomplete.routing import ReplicaPool, get_pool
+from suitable_django_autocomplete.views import ModelAutocompleteView
+
+
+class ReplicaPoolTest(SimpleTestCase):
+    """Test round-robin selection and failover."""
+
+    def test_round_robin(self):
+        pool = ReplicaPool(['replica1', 'replica2'])
+        self.assertEqual([pool.choose() for _ in range(4)], ['replica1', 'replica2'] * 2)
+
+    def test_failed_replicas_are_skipped(self):
+        pool = ReplicaPool(['replica1', 'replica2'], retry_after=60)
+        tried = []
+
+        def read(alias):
+            tried.append(alias)
+            if alias == 'replica1':
+                raise OperationalError('connection refused')
+            return alias
+
+        self.assertEqual(pool.run(read), 'replica2')
+        self.assertEqual(tried, ['replica1', 'replica2'])
+        self.assertEqual(pool.healthy(), ['replica2'])
+        self.assertEqual([pool.choose() for _ in range(2)], ['replica2'] * 2)
+
+        pool.mark_up('replica1')
+        self.assertEqual(pool.healthy(), ['replica1', 'replica2'])
+
+    def test_falls_back_to_primary(self):
+        pool = ReplicaPool(['replica1'], primary='main', retry_after=60)
+
+        def read(alias):
+            if alias != 'main':
+                raise OperationalError('connection refused')
+            return alias
+
+        self.assertEqual(pool.run(read), 'main')
+        self.assertEqual(pool.choose(), 'main')
+
+        def broken(alias):
+            raise OperationalError('everything is down')
+
+        with self.assertRaises(OperationalError):
+            pool.run(broken)
+
+    def test_alias_lists_share_a_pool(self):
+        self.assertIs(get_pool(['a', 'b']), get_pool(('a', 'b')))
+        self.assertIsNone(get_pool('a'))
+        self.assertIsNone(get_pool(None))
+
+
+class RoutedUserView(ModelAutocompleteView):
+    model = User
+    search_fields = ['username']
+    using = ['replica']
+
+
+class UserForm(forms.Form):
+    user = ModelAutocompleteField(queryset=User.objects.all(), url='/users/', using='replica')
+    users = ModelMultipleAutocompleteField(queryset=User.objects.all(), url='/users/', using='replica',
+                                           required=False)
+
+
+class ReplicaRoutingTest(TestCase):
+    """Test that views and fields read from replicas and fall back for fresh rows."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        # Replicated long ago, so on both databases
+        self.alice = User.objects.create_user('alice')
+        self.alice.save(using='replica')
+        # Just created: only on the primary so far
+        self.bob = User.objects.create_user('bob')
+
+    def test_view_searches_the_replica(self):
+        with self.assertNumQueries(1, using='replica'), self.assertNumQueries(0, using='default'):
+            results = RoutedUserView().get_results_within_budget('o')[0]
+        self.assertEqual(results, [])
+
+        view = RoutedUserView()
+        self.assertEqual([r['label'] for r in view.get_results_within_budget('ali')[0]], ['alice'])
+        self.assertEqual(view.get_db_alias(), 'replica')
+
+    def test_validation_finds_rows_on_the_replica(self):
+        form = UserForm({'user': str(self.alice.pk)})
+        with self.assertNumQueries(1, using='replica'), self.assertNumQueries(0, using='default'):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['user']._state.db, 'replica')
+
+    def test_validation_falls_back_to_the_primary(self):
+        form = UserForm({'user': str(self.bob.pk), 'users': [str(self.alice.pk), str(self.bob.pk)]})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['user'], self.bob)
+        self.assertEqual({user.username for user in form.cleaned_data['users']}, {'alice', 'bob'})
+
+    def test_validation_leaves_the_field_alone(self):
+        form = UserForm({'user': str(self.alice.pk), 'users': [str(self.alice.pk), str(self.bob.pk)]})
+        field = form.fields['users']
+        queryset, choices = field.queryset, field.widget.choices
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertIs(field.queryset, queryset)
+        self.assertIs(field.widget.choices, choices)
+
+    def test_unknown_keys_are_still_invalid(self):
+        form = UserForm({'user': '999', 'users': ['999']})
+        self.assertFalse(form.is_valid())
+        self.assertIn('user', form.errors)
+        self.assertIn('users', form.errors)
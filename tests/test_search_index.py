@@ -0,0 +1,115 @@
+"""
+Tests for the denormalized search index.
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from suitable_django_autocomplete.models import SearchEntry, SearchToken
+from suitable_django_autocomplete.search_index import SearchIndex, register, unregister
+from suitable_django_autocomplete.views import ModelAutocompleteView
+
+
+class ActiveUserIndex(SearchIndex):
+    name = 'users'
+    model = User
+    search_fields = ['username', 'first_name', 'last_name']
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
+class IndexedUserView(ModelAutocompleteView):
+    model = User
+    search_fields = ['username']
+    search_index = 'users'
+
+
+class SearchIndexTest(TestCase):
+    """Test index maintenance and querying."""
+
+    def setUp(self):
+        register(ActiveUserIndex)
+        self.addCleanup(unregister, 'users')
+        self.user = User.objects.create_user('jdoe', first_name='Jöhn', last_name='Doe')
+
+    def test_entry_is_created_on_save(self):
+        entry = SearchEntry.objects.get(index='users', object_id=str(self.user.pk))
+        self.assertEqual(entry.label, 'jdoe')
+        self.assertEqual(entry.search_text, 'jdoe john doe')
+
+    def test_entry_follows_updates_and_deletes(self):
+        self.user.last_name = 'Smith'
+        self.user.save()
+        self.assertEqual(SearchEntry.objects.get(index='users').search_text, 'jdoe john smith')
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(SearchEntry.objects.filter(index='users').exists())
+
+        self.user.is_active = True
+        self.user.save()
+        self.user.delete()
+        self.assertFalse(SearchEntry.objects.filter(index='users').exists())
+
+    def test_view_queries_the_index(self):
+        johnny = User.objects.create_user('johnny')
+        User.objects.create_user('ajohnson')
+        with self.assertNumQueries(1):
+            results = IndexedUserView().get_results('JOHN')
+        # Word prefixes match, the whole text starting with the query ranks first
+        self.assertEqual(results, [
+            {'value': str(johnny.pk), 'label': 'johnny'},
+            {'value': str(self.user.pk), 'label': 'jdoe'},
+        ])
+
+    def test_view_keeps_its_queryset_scope(self):
+        other = User.objects.create_user('johnny', is_staff=True)
+
+        class StaffUserView(IndexedUserView):
+            def get_queryset(self):
+                return super().get_queryset().filter(is_staff=True)
+
+        self.assertEqual(StaffUserView().get_results('john'), [{'value': str(other.pk), 'label': 'johnny'}])
+        self.assertEqual(len(IndexedUserView().get_results('john')), 2)
+
+    def test_every_query_word_must_match(self):
+        User.objects.create_user('jane', last_name='Doe')
+        self.assertEqual([label for _, label in ActiveUserIndex().search('do jo')], ['jdoe'])
+        self.assertEqual(ActiveUserIndex().search('   '), [])
+
+    def test_exact_matches_rank_first(self):
+        User.objects.create_user('doe')
+        self.assertEqual([label for _, label in ActiveUserIndex().search('doe')], ['doe', 'jdoe'])
+
+    def test_substring_matching(self):
+        class SubstringIndex(ActiveUserIndex):
+            match_substrings = True
+
+        ajohnson = User.objects.create_user('ajohnson')
+        self.assertEqual(ActiveUserIndex().search('ohn'), [])
+        self.assertEqual(SubstringIndex().search('ohn'), [
+            (str(ajohnson.pk), 'ajohnson'),
+            (str(self.user.pk), 'jdoe'),
+        ])
+
+    def test_tokens_follow_the_entry(self):
+        tokens = SearchToken.objects.filter(index='users').order_by('token')
+        self.assertEqual([token.token for token in tokens], ['doe', 'jdoe', 'john'])
+        self.user.delete()
+        self.assertFalse(SearchToken.objects.filter(index='users').exists())
+
+    def test_rebuild_command(self):
+        User.objects.filter(pk=self.user.pk).update(last_name='Bulk')  # bypasses signals
+        out = StringIO()
+        call_command('rebuild_search_index', 'users', stdout=out)
+        self.assertIn("Indexed 1 objects in 'users'", out.getvalue())
+        self.assertEqual(SearchEntry.objects.get(index='users').search_text, 'jdoe john bulk')
+        self.assertEqual(ActiveUserIndex().search('bul'), [(str(self.user.pk), 'jdoe')])
+        self.assertEqual(ActiveUserIndex().search('doe'), [])
+
+    def test_duplicate_registration_is_rejected(self):
+        with self.assertRaises(ValueError):
+            register(ActiveUserIndex)
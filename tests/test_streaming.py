@@ -0,0 +1,216 @@
+"""
+Tests for streamed (NDJSON) autocomplete responses.
+"""
+
+import json
+import threading
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TestCase, RequestFactory, override_settings
+from suitable_django_autocomplete.coalescing import acquire_cache_lock, release_cache_lock
+from suitable_django_autocomplete.routing import ReplicaPool
+from suitable_django_autocomplete.views import ModelAutocompleteView, SimpleAutocompleteView
+
+
+class StreamedUserView(ModelAutocompleteView):
+    model = User
+    search_fields = ['username']
+    stream = True
+
+
+class StreamedWordView(SimpleAutocompleteView):
+    choices = ['receive', 'recipe', 'deceive']
+    fuzzy = True
+    stream = True
+
+
+class StreamingMixin:
+    """Helpers to request and read streamed responses."""
+
+    def stream(self, view_class, query):
+        request = RequestFactory().get('/', {'q': query}, HTTP_ACCEPT='application/x-ndjson, application/json')
+        response = view_class.as_view()(request)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def labels(self, chunks):
+        return [[result['label'] if isinstance(result, dict) else result for result in chunk['results']]
+                for chunk in chunks]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class StreamingTest(StreamingMixin, TestCase):
+    """Test that result tiers are streamed cheapest first."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        User.objects.create_user('joanna')
+        User.objects.create_user('anna')
+        User.objects.create_user('annabel')
+        cache.clear()
+
+    def test_prefix_matches_come_first(self):
+        chunks = self.stream(StreamedUserView, 'ann')
+        self.assertEqual(self.labels(chunks), [['anna', 'annabel'], ['joanna'], []])
+        self.assertEqual([chunk.get('done', False) for chunk in chunks], [False, False, True])
+
+    def test_clients_without_ndjson_get_json(self):
+        response = StreamedUserView.as_view()(self.factory.get('/', {'q': 'ann'}))
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(json.loads(response.content)['results']), 3)
+
+    def test_fuzzy_matches_come_last(self):
+        chunks = self.stream(StreamedWordView, 'recieve')
+        self.assertEqual(self.labels(chunks), [[], ['receive', 'recipe', 'deceive'], []])
+
+    def test_cached_results_are_one_chunk(self):
+        class CachedView(StreamedUserView):
+            cache_timeout = 60
+
+        self.stream(CachedView, 'ann')
+        with self.assertNumQueries(0):
+            chunks = self.stream(CachedView, 'ann')
+        self.assertEqual(self.labels(chunks), [['anna', 'annabel', 'joanna']])
+        self.assertTrue(chunks[0]['done'])
+
+    def test_custom_get_results_is_one_chunk(self):
+        class CustomView(StreamedUserView):
+            def get_results(self, query):
+                return [{'value': '1', 'label': 'custom'}]
+
+        self.assertEqual(self.labels(self.stream(CustomView, 'ann')), [['custom'], []])
+
+    def test_budget_spent_by_a_later_tier(self):
+        class SlowSubstringView(StreamedUserView):
+            time_budget = 0.05
+
+            def search_queryset(self, query, search_query, limit, exclude=()):
+                if exclude:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+                            "WHERE x < 100000000) SELECT count(*) FROM c"
+                        )
+                return super().search_queryset(query, search_query, limit, exclude)
+
+        chunks = self.stream(SlowSubstringView, 'ann')
+        self.assertEqual(self.labels(chunks), [['anna', 'annabel'], []])
+        self.assertTrue(chunks[-1]['done'])
+        self.assertTrue(chunks[-1]['partial'])
+
+    def test_coalesced_streams_share_one_query(self):
+        calls = []
+        release = threading.Event()
+
+        class CoalescedView(StreamedWordView):
+            coalesce = True
+
+            def get_results(self, query):
+                calls.append(query)
+                release.wait(1)
+                return super().get_results(query)
+
+        chunks = [None] * 4
+        barrier = threading.Barrier(4)
+
+        def run(position):
+            barrier.wait()
+            chunks[position] = self.stream(CoalescedView, 'recieve')
+
+        threads = [threading.Thread(target=run, args=(position,)) for position in range(4)]
+        for thread in threads:
+            thread.start()
+        threading.Timer(0.2, release.set).start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, ['recieve'])
+        for response in chunks:
+            self.assertEqual(self.labels(response), [['receive', 'recipe', 'deceive']])
+            self.assertTrue(response[0]['done'])
+
+    def test_streams_wait_for_another_process(self):
+        class LockedView(StreamedWordView):
+            cache_timeout = 60
+            coalesce = True
+            coalesce_lock_timeout = 2
+
+        view = LockedView()
+        lock_key = f"{view.get_cache_key('rec')}:lock"
+        token = acquire_cache_lock(cache, lock_key, 2)
+
+        def other_process_finishes():
+            view.set_cached_results('rec', ['from elsewhere'])
+            release_cache_lock(cache, lock_key, token)
+
+        threading.Timer(0.1, other_process_finishes).start()
+        self.assertEqual(self.labels(self.stream(LockedView, 'rec')), [['from elsewhere']])
+
+    def test_stale_results_are_refreshed_once(self):
+        class StaleView(StreamedUserView):
+            cache_timeout = 60
+            cache_stale_timeout = 60
+
+        view = StaleView()
+        view.set_cached_results('ann', [{'value': '0', 'label': 'old'}])
+        cache.delete(f"{view.get_cache_key('ann')}:fresh")
+
+        # Someone else is refreshing: stream the stale results
+        lock_key = f"{view.get_cache_key('ann')}:lock"
+        token = acquire_cache_lock(cache, lock_key, 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.labels(self.stream(StaleView, 'ann')), [['old']])
+
+        # Nobody is: refresh and stream the new results
+        release_cache_lock(cache, lock_key, token)
+        self.assertEqual(self.labels(self.stream(StaleView, 'ann')), [['anna', 'annabel', 'joanna']])
+        self.assertEqual(view.get_cached_entry('ann')[1], True)
+
+
+class FailingReplicaView(StreamedUserView):
+    """Searches fail on the replica, from the given tier on."""
+    fail_from_tier = 0
+
+    def search_queryset(self, query, search_query, limit, exclude=()):
+        tier = 1 if exclude else 0
+        if self.get_db_alias() == 'replica' and tier >= self.fail_from_tier:
+            raise OperationalError('connection refused')
+        return super().search_queryset(query, search_query, limit, exclude)
+
+
+class StreamingFailoverTest(StreamingMixin, TestCase):
+    """Test that streams fail over between replicas and always finish."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        for username in ['joanna', 'anna', 'annabel']:
+            User.objects.create_user(username).save(using='replica')
+
+    def test_down_replica_is_skipped(self):
+        pool = ReplicaPool(['replica'], retry_after=60)
+
+        class View(FailingReplicaView):
+            using = pool
+
+        chunks = self.stream(View, 'ann')
+        self.assertEqual(self.labels(chunks), [['anna', 'annabel'], ['joanna'], []])
+        self.assertNotIn('partial', chunks[-1])
+        self.assertEqual(pool.healthy(), [])
+
+    def test_replica_failing_mid_stream_still_finishes(self):
+        pool = ReplicaPool(['replica'], retry_after=60)
+
+        class View(FailingReplicaView):
+            using = pool
+            fail_from_tier = 1
+
+        chunks = self.stream(View, 'ann')
+        self.assertEqual(self.labels(chunks), [['anna', 'annabel'], []])
+        self.assertTrue(chunks[-1]['done'])
+        self.assertTrue(chunks[-1]['partial'])
+        self.assertEqual(pool.healthy(), [])
@@ -6,7 +6,7 @@ import json
 from django.test import TestCase, RequestFactory
 from django.contrib.auth.models import User
 from django import forms
-from suitable_django_autocomplete import ModelAutocompleteField, AutocompleteWidget
+from suitable_django_autocomplete import AutocompleteField, ModelAutocompleteField, AutocompleteWidget
 from suitable_django_autocomplete.views import ModelAutocompleteView
 
 
@@ -77,7 +77,41 @@ class ValueLabelPatternTest(TestCase):
         
         self.assertEqual(context['widget']['value_field'], 'value')
         self.assertEqual(context['widget']['label_field'], 'label')
-    
+
+    def test_local_data_source(self):
+        """Test that a local data source is rendered for the search worker."""
+        widget = AutocompleteWidget(url='/autocomplete/products/', source='/static/data/products.json', limit=5)
+
+        html = widget.render('product', None)
+
+        self.assertIn('data-source="/static/data/products.json"', html)
+        self.assertIn('data-limit="5"', html)
+        self.assertNotIn('data-source', AutocompleteWidget(url='/x/').render('product', None))
+
+    def test_local_data_source_without_url(self):
+        """Test that a field with only a source renders without reversing a URL."""
+        class AirportForm(forms.Form):
+            airport = AutocompleteField(source='/static/data/airports.json')
+
+        html = str(AirportForm()['airport'])
+
+        self.assertIn('data-source="/static/data/airports.json"', html)
+        self.assertNotIn('endpoint=', html)
+
+    def test_lazy_hydration(self):
+        """Test that lazy elements render their mode and initial display value."""
+        widget = AutocompleteWidget(
+            url='/autocomplete/products/',
+            initial_display_value='iPhone 15',
+            lazy='visible',
+        )
+
+        html = widget.render('product', '1')
+
+        self.assertIn('lazy="visible"', html)
+        self.assertIn('value="iPhone 15"', html)
+        self.assertNotIn('lazy=', AutocompleteWidget(url='/x/').render('product', None))
+
     def test_initial_display_value(self):
         """Test that initial display values are properly set."""
         widget = AutocompleteWidget(